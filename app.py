@@ -1,19 +1,33 @@
 import streamlit as st
+import importlib
 import os
-from dotenv import load_dotenv
+import re
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
 import json
 
-# Load environment variables
-load_dotenv()
+# Importing config loads the .env file exactly once per process
+from config import CONFIG
 
-# Import database utilities
-try:
-    from utils.database import get_database_manager, track_tool_usage
-    DB_AVAILABLE = True
-except ImportError:
-    DB_AVAILABLE = False
-    st.warning("Database utilities not available. Usage tracking disabled.")
+# Import database utilities lazily so the home page cold start skips the DB driver
+@lru_cache(maxsize=1)
+def _database_module():
+    try:
+        from utils import database
+        return database
+    except ImportError:
+        return None
+
+def _db_available() -> bool:
+    return _database_module() is not None
+
+def track_tool_usage(tool_name: str, action_type: str):
+    """Record tool usage; silently a no-op when the database is unavailable"""
+    database = _database_module()
+    if database is not None:
+        database.track_tool_usage(tool_name, action_type)
 
 # Configure page
 st.set_page_config(
@@ -23,10 +37,22 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Dark palette declared once and shared by the media query and the
+# explicit data-theme override below
+_DARK_VARS = """\
+            --bg-primary: #0f172a;
+            --bg-secondary: #1e293b;
+            --bg-tertiary: #334155;
+            --text-primary: #f8fafc;
+            --text-secondary: #cbd5e1;
+            --text-muted: #94a3b8;
+            --border-color: #475569;
+            --shadow-light: rgba(0, 0, 0, 0.2);
+            --shadow-medium: rgba(0, 0, 0, 0.3);
+            --shadow-heavy: rgba(0, 0, 0, 0.4);"""
+
 # Enhanced CSS for responsive design and dark mode support
-def load_css():
-    st.markdown("""
-    <style>
+_CSS = """
     /* CSS Custom Properties for Theme Support */
     :root {
         --primary-gradient: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -50,31 +76,25 @@ def load_css():
     /* Dark Mode Colors */
     @media (prefers-color-scheme: dark) {
         :root {
-            --bg-primary: #0f172a;
-            --bg-secondary: #1e293b;
-            --bg-tertiary: #334155;
-            --text-primary: #f8fafc;
-            --text-secondary: #cbd5e1;
-            --text-muted: #94a3b8;
-            --border-color: #475569;
-            --shadow-light: rgba(0, 0, 0, 0.2);
-            --shadow-medium: rgba(0, 0, 0, 0.3);
-            --shadow-heavy: rgba(0, 0, 0, 0.4);
+__DARK_VARS__
+        }
+
+        .feature-card {
+            border-color: rgba(255, 255, 255, 0.1);
+        }
+
+        .main-header {
+            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.3);
+        }
+
+        .stButton > button {
+            box-shadow: 0 4px 16px rgba(102, 126, 234, 0.2);
         }
     }
 
     /* Streamlit Dark Mode Override */
     .stApp[data-theme="dark"] {
-        --bg-primary: #0f172a;
-        --bg-secondary: #1e293b;
-        --bg-tertiary: #334155;
-        --text-primary: #f8fafc;
-        --text-secondary: #cbd5e1;
-        --text-muted: #94a3b8;
-        --border-color: #475569;
-        --shadow-light: rgba(0, 0, 0, 0.2);
-        --shadow-medium: rgba(0, 0, 0, 0.3);
-        --shadow-heavy: rgba(0, 0, 0, 0.4);
+__DARK_VARS__
     }
 
     /* Base Styles */
@@ -95,7 +115,6 @@ def load_css():
         position: relative;
         overflow: hidden;
         box-shadow: 0 20px 40px var(--shadow-medium);
-        backdrop-filter: blur(10px);
     }
 
     .main-header::before {
@@ -123,6 +142,12 @@ def load_css():
     }
 
     /* Enhanced Feature Cards */
+    .feature-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+        gap: 1rem;
+    }
+
     .feature-card {
         background: var(--bg-primary);
         padding: 2rem;
@@ -130,10 +155,9 @@ def load_css():
         border: 1px solid var(--border-color);
         margin: 1rem 0;
         box-shadow: 0 8px 32px var(--shadow-light);
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+        transition: transform 0.3s cubic-bezier(0.4, 0, 0.2, 1), opacity 0.3s ease;
         position: relative;
         overflow: hidden;
-        backdrop-filter: blur(10px);
     }
 
     .feature-card::before {
@@ -232,7 +256,7 @@ def load_css():
         text-align: center;
         margin: 0.8rem 0;
         box-shadow: 0 8px 24px rgba(79, 172, 254, 0.3);
-        transition: all 0.3s ease;
+        transition: transform 0.3s ease;
     }
 
     .metric-card:hover {
@@ -249,7 +273,7 @@ def load_css():
         padding: 0.8rem 1.5rem;
         font-weight: 600;
         font-size: 0.95rem;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+        transition: transform 0.3s cubic-bezier(0.4, 0, 0.2, 1);
         box-shadow: 0 4px 16px rgba(102, 126, 234, 0.3);
         width: 100%;
         margin: 0.3rem 0;
@@ -282,7 +306,7 @@ def load_css():
         border-radius: 12px;
         border: 1px solid var(--border-color);
         box-shadow: 0 4px 16px var(--shadow-light);
-        transition: all 0.3s ease;
+        transition: transform 0.3s ease;
     }
 
     .stMetric:hover {
@@ -360,22 +384,6 @@ def load_css():
         }
     }
 
-    /* Dark mode specific enhancements */
-    @media (prefers-color-scheme: dark) {
-        .feature-card {
-            backdrop-filter: blur(20px);
-            border-color: rgba(255, 255, 255, 0.1);
-        }
-
-        .main-header {
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.3);
-        }
-
-        .stButton > button {
-            box-shadow: 0 4px 16px rgba(102, 126, 234, 0.2);
-        }
-    }
-
     /* Scrollbar Styling */
     ::-webkit-scrollbar {
         width: 8px;
@@ -417,292 +425,281 @@ def load_css():
         }
     }
 
-    .feature-card {
-        animation: fadeInUp 0.6s ease-out forwards;
+    /* Animate cards on the session's first render only, and respect reduced-motion */
+    @media (prefers-reduced-motion: no-preference) {
+        .first-load .feature-card {
+            animation: fadeInUp 0.6s ease-out forwards;
+            animation-delay: calc(var(--i, 0) * 0.1s);
+        }
     }
-
-    .feature-card:nth-child(2) { animation-delay: 0.1s; }
-    .feature-card:nth-child(3) { animation-delay: 0.2s; }
-    .feature-card:nth-child(4) { animation-delay: 0.3s; }
-    .feature-card:nth-child(5) { animation-delay: 0.4s; }
-    .feature-card:nth-child(6) { animation-delay: 0.5s; }
-    </style>
-    """, unsafe_allow_html=True)
-
-def main():
-    load_css()
-    
-    # Enhanced main header with better structure
-    st.markdown("""
+"""
+
+_CSS = _CSS.replace("__DARK_VARS__", _DARK_VARS)
+
+def _minify_css(css: str) -> str:
+    """Minify CSS by stripping comments and collapsing whitespace"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.strip()
+
+# Minified once at import so every session ships the small form
+_CSS_MIN = _minify_css(_CSS)
+
+# Feature cards for the home page grid
+_FEATURES = [
+    ("💬 Smart Chat",
+     "Intelligent conversations with advanced context understanding and natural language processing capabilities.",
+     ["Natural language processing", "Context-aware responses", "Multi-turn conversations", "Real-time interactions"]),
+    ("👁️ Vision Analysis",
+     "Advanced image and visual content analysis with state-of-the-art computer vision technology.",
+     ["Object detection & recognition", "Scene understanding", "Text extraction (OCR)", "Image content analysis"]),
+    ("📄 Document AI",
+     "Intelligent document processing and analysis with comprehensive understanding capabilities.",
+     ["PDF analysis & processing", "Content summarization", "Q&A on documents", "Information extraction"]),
+    ("💻 Code Assistant",
+     "AI-powered coding companion that helps with development tasks and code optimization.",
+     ["Code generation & completion", "Bug detection & fixing", "Code explanation & docs", "Best practices guidance"]),
+    ("✍️ Creative Writer",
+     "AI-enhanced creative writing tools for content creation and storytelling excellence.",
+     ["Story & content generation", "Creative ideation support", "Style adaptation & editing", "Writing enhancement"]),
+    ("📊 Data Analyst",
+     "Intelligent data analysis and visualization with comprehensive statistical insights.",
+     ["Data insights & patterns", "Chart & graph generation", "Statistical analysis", "Predictive modeling"]),
+]
+
+# Static HTML/markdown built once at import instead of on every rerun
+_HEADER_HTML = """
     <div class="main-header">
         <h1>🚀 GeminiCraft Studio</h1>
         <p>Your AI-Powered Creative Workspace</p>
         <p><em>Harness the power of Google's Gemini AI for creative and analytical tasks</em></p>
     </div>
-    """, unsafe_allow_html=True)
-    
-    # Enhanced sidebar
-    with st.sidebar:
-        st.markdown("## 🎯 AI Tools")
-        
-        # Navigation with enhanced styling
-        if st.button("💬 Smart Chat Assistant", use_container_width=True):
-            if DB_AVAILABLE:
-                track_tool_usage("smart_chat", "page_visit")
-            st.session_state.page = "chat"
-        
-        if st.button("👁️ Vision & Image Analysis", use_container_width=True):
-            if DB_AVAILABLE:
-                track_tool_usage("vision_analysis", "page_visit")
-            st.session_state.page = "vision"
-        
-        if st.button("📄 Document Intelligence", use_container_width=True):
-            if DB_AVAILABLE:
-                track_tool_usage("document_intelligence", "page_visit")
-            st.session_state.page = "document"
-        
-        if st.button("💻 Code Assistant", use_container_width=True):
-            if DB_AVAILABLE:
-                track_tool_usage("code_assistant", "page_visit")
-            st.session_state.page = "code"
-        
-        if st.button("✍️ Creative Writer", use_container_width=True):
-            if DB_AVAILABLE:
-                track_tool_usage("creative_writer", "page_visit")
-            st.session_state.page = "writer"
-        
-        if st.button("📊 Data Analyst", use_container_width=True):
-            if DB_AVAILABLE:
-                track_tool_usage("data_analyst", "page_visit")
-            st.session_state.page = "data"
-        
-        st.markdown("---")
-        
-        # Enhanced info panel
-        st.markdown("""
+    """
+
+_SIDEBAR_INFO_HTML = """
         <div class="sidebar-info">
             <h4>🔧 Studio Info</h4>
             <p><strong>Model:</strong> Gemini 1.5 Pro</p>
             <p><strong>Features:</strong> 6+ AI Tools</p>
             <p><strong>Status:</strong> Online ✅</p>
         </div>
-        """, unsafe_allow_html=True)
-        
-        # Enhanced usage stats
-        st.markdown("### 📈 Session Stats")
-        
-        if DB_AVAILABLE:
-            try:
-                db = get_database_manager()
-                stats = db.get_usage_statistics()
-                
-                total_queries = stats.get("total_actions", 0)
-                tools_used = len(stats.get("tool_usage", {}))
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Queries", f"{total_queries}", f"+{total_queries}")
-                with col2:
-                    st.metric("Tools Used", f"{tools_used}", f"+{tools_used}")
-                
-                # Show top tool if available
-                if stats.get("tool_usage"):
-                    top_tool = max(stats["tool_usage"].items(), key=lambda x: x[1])
-                    st.caption(f"🔥 Most used: {top_tool[0].replace('_', ' ').title()}")
-                    
-            except Exception as e:
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Queries", "0", "0")
-                with col2:
-                    st.metric("Tools Used", "0", "0")
-                st.caption("⚠️ Stats unavailable")
-        else:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Queries", "0", "0")
-            with col2:
-                st.metric("Tools Used", "0", "0")
-    
-    # Main content area
-    if "page" not in st.session_state:
-        st.session_state.page = "home"
-    
-    # Enhanced home page
-    if st.session_state.page == "home":
-        # Responsive grid layout
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("""
-            <div class="feature-card">
-                <h3>💬 Smart Chat</h3>
-                <p>Intelligent conversations with advanced context understanding and natural language processing capabilities.</p>
-                <ul>
-                    <li>Natural language processing</li>
-                    <li>Context-aware responses</li>
-                    <li>Multi-turn conversations</li>
-                    <li>Real-time interactions</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("""
-            <div class="feature-card">
-                <h3>👁️ Vision Analysis</h3>
-                <p>Advanced image and visual content analysis with state-of-the-art computer vision technology.</p>
-                <ul>
-                    <li>Object detection & recognition</li>
-                    <li>Scene understanding</li>
-                    <li>Text extraction (OCR)</li>
-                    <li>Image content analysis</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown("""
-            <div class="feature-card">
-                <h3>📄 Document AI</h3>
-                <p>Intelligent document processing and analysis with comprehensive understanding capabilities.</p>
-                <ul>
-                    <li>PDF analysis & processing</li>
-                    <li>Content summarization</li>
-                    <li>Q&A on documents</li>
-                    <li>Information extraction</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        col4, col5, col6 = st.columns(3)
-        
-        with col4:
-            st.markdown("""
-            <div class="feature-card">
-                <h3>💻 Code Assistant</h3>
-                <p>AI-powered coding companion that helps with development tasks and code optimization.</p>
-                <ul>
-                    <li>Code generation & completion</li>
-                    <li>Bug detection & fixing</li>
-                    <li>Code explanation & docs</li>
-                    <li>Best practices guidance</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col5:
-            st.markdown("""
-            <div class="feature-card">
-                <h3>✍️ Creative Writer</h3>
-                <p>AI-enhanced creative writing tools for content creation and storytelling excellence.</p>
-                <ul>
-                    <li>Story & content generation</li>
-                    <li>Creative ideation support</li>
-                    <li>Style adaptation & editing</li>
-                    <li>Writing enhancement</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col6:
-            st.markdown("""
-            <div class="feature-card">
-                <h3>📊 Data Analyst</h3>
-                <p>Intelligent data analysis and visualization with comprehensive statistical insights.</p>
-                <ul>
-                    <li>Data insights & patterns</li>
-                    <li>Chart & graph generation</li>
-                    <li>Statistical analysis</li>
-                    <li>Predictive modeling</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Enhanced quick start section
-        st.markdown("---")
-        st.markdown("## 🚀 Quick Start")
-        
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            st.markdown("""
+        """
+
+_QUICKSTART_MD = """
+            ---
+            ## 🚀 Quick Start
+
             **Get started with GeminiCraft Studio in just a few steps:**
-            
+
             1. **Choose Your Tool** - Select an AI tool from the sidebar that matches your needs
-            2. **Upload & Input** - Upload files or enter your query with detailed instructions  
+            2. **Upload & Input** - Upload files or enter your query with detailed instructions
             3. **AI Magic** - Let our advanced Gemini AI process and analyze your request
             4. **Export Results** - Save, download, or share your AI-generated results
-            
+
             Experience the future of AI-powered productivity today!
-            """)
-        
-        with col2:
-            if st.button("🎯 Try Smart Chat", type="primary", use_container_width=True, key="try_chat_home"):
-                if DB_AVAILABLE:
-                    track_tool_usage("smart_chat", "page_visit")
-                st.session_state.page = "chat"
-                st.rerun()
+            """
+
+# Sidebar navigation options mapped to (page key, tool name for tracking)
+_NAV_OPTIONS = {
+    "🏠 Home": ("home", None),
+    "💬 Smart Chat Assistant": ("chat", "smart_chat"),
+    "👁️ Vision & Image Analysis": ("vision", "vision_analysis"),
+    "📄 Document Intelligence": ("document", "document_intelligence"),
+    "💻 Code Assistant": ("code", "code_assistant"),
+    "✍️ Creative Writer": ("writer", "creative_writer"),
+    "📊 Data Analyst": ("data", "data_analyst"),
+}
+
+def _card_html(index: int, title: str, description: str, bullets) -> str:
+    """Build the HTML for a single feature card; --i staggers the entry animation"""
+    items = "".join(f"<li>{item}</li>" for item in bullets)
+    return (
+        f'<div class="feature-card" style="--i:{index}">'
+        f'<h3>{title}</h3>'
+        f'<p>{description}</p>'
+        f'<ul>{items}</ul>'
+        f'</div>'
+    )
+
+def _render_session_metrics(queries: int = 0, tools: int = 0, caption: str = None):
+    """Render the two sidebar stat metrics plus an optional caption"""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Queries", f"{queries}", f"+{queries}")
+    with col2:
+        st.metric("Tools Used", f"{tools}", f"+{tools}")
+    if caption:
+        st.caption(caption)
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _cached_usage_stats(session_id: str):
+    """Fetch usage statistics at most once per TTL window instead of per rerun.
+
+    session_id is part of the cache key: the query is session-scoped, so
+    without it one session's stats would be served to every session for
+    the TTL window.
+    """
+    stats = _database_module().get_database_manager().get_usage_statistics()
+    # Precompute the most-used tool here so reruns just read it back
+    tool_usage = stats.get("tool_usage") or {}
+    stats["top_tool"] = max(tool_usage.items(), key=itemgetter(1))[0] if tool_usage else None
+    return stats
+
+# Route table: page key -> (module, loader function, display name)
+_PAGES = {
+    "chat": ("pages.smart_chat", "load_chat_page", "Smart Chat"),
+    "vision": ("pages.vision_analysis", "load_vision_page", "Vision Analysis"),
+    "document": ("pages.document_intelligence", "load_document_intelligence_page", "Document Intelligence"),
+    "code": ("pages.code_assistant", "load_code_assistant_page", "Code Assistant"),
+    "writer": ("pages.creative_writer", "load_creative_writer_page", "Creative Writer"),
+    "data": ("pages.data_analyst", "load_data_analyst_page", "Data Analyst"),
+}
+
+def _dispatch(page: str):
+    """Import and run the loader for the requested page"""
+    module_name, loader_name, display_name = _PAGES[page]
+    try:
+        module = importlib.import_module(module_name)
+        getattr(module, loader_name)()
+    except ImportError as e:
+        st.error(f"Error loading {display_name}: {e}")
+        if st.button("🏠 Back to Home"):
+            st.session_state.page = "home"
+            st.rerun()
+
+_STATIC_DIR = Path(__file__).parent / "static"
+
+@lru_cache(maxsize=1)
+def _write_static_css() -> bool:
+    """Write the minified stylesheet to the static dir once per process.
+
+    Lets the browser cache the CSS across reruns and sessions instead of
+    re-parsing an inline <style> block on every DOM update. Requires
+    server.enableStaticServing (see .streamlit/config.toml).
+    """
+    try:
+        _STATIC_DIR.mkdir(exist_ok=True)
+        css_path = _STATIC_DIR / "app.css"
+        if not css_path.exists() or css_path.read_text() != _CSS_MIN:
+            css_path.write_text(_CSS_MIN)
+        return True
+    except OSError:
+        return False
+
+def load_css():
+    # Emitted on every run: Streamlit prunes elements missing from the
+    # latest script run, so a once-per-session guard would drop the
+    # stylesheet after the first full rerun. The payload is tiny in the
+    # static-serving path — just a <link> the browser has cached.
+    if CONFIG.DEBUG_MODE:
+        # Readable inline stylesheet for quick iteration in dev
+        st.html(f"<style>{_CSS}</style>")
+    elif _write_static_css():
+        st.html('<link rel="stylesheet" href="app/static/app.css">')
+    else:
+        st.html(f"<style>{_CSS_MIN}</style>")
+
+@st.fragment
+def _sidebar():
+    """Sidebar fragment: nav clicks rerun only this block, not the whole script.
+
+    Rendered via ``with st.sidebar: _sidebar()`` — fragments must draw
+    into their own container, so the sidebar nesting lives at the call
+    site rather than in here.
+    """
+    st.markdown("## 🎯 AI Tools")
+
+    # Single radio widget for navigation instead of six separate buttons.
+    # The selection derives from st.session_state.page so navigation that
+    # bypasses the radio (e.g. the home page's "Try Smart Chat" CTA)
+    # keeps the radio in sync and every option stays reachable.
+    options = list(_NAV_OPTIONS.keys())
+    current = st.session_state.get("page", "home")
+    index = next(
+        (i for i, name in enumerate(options) if _NAV_OPTIONS[name][0] == current), 0
+    )
+    choice = st.radio(
+        "Navigation",
+        options,
+        index=index,
+        label_visibility="collapsed"
+    )
+    page, tool_name = _NAV_OPTIONS[choice]
+    if page != current:
+        if tool_name:
+            track_tool_usage(tool_name, "page_visit")
+        st.session_state.page = page
+        st.rerun()
+
+    st.markdown("---")
+
+    # Enhanced info panel
+    st.html(_SIDEBAR_INFO_HTML)
+
+    # Enhanced usage stats
+    st.markdown("### 📈 Session Stats")
+
+    try:
+        if _db_available():
+            session_id = _database_module().get_database_manager().get_session_id()
+            stats = _cached_usage_stats(session_id)
+        else:
+            stats = {}
+        caption = None
+        if stats.get("top_tool"):
+            caption = f"🔥 Most used: {stats['top_tool'].replace('_', ' ').title()}"
+        _render_session_metrics(
+            stats.get("total_actions", 0),
+            len(stats.get("tool_usage", {})),
+            caption
+        )
+    except Exception:
+        _render_session_metrics(caption="⚠️ Stats unavailable")
+
+@st.fragment
+def _home():
+    """Home page fragment: isolated from sidebar-only reruns"""
+    # Responsive grid layout: all six cards in one HTML container.
+    # Entry animation runs on the first render only so reruns skip repaints.
+    grid_class = "feature-grid"
+    if not st.session_state.get("_animated"):
+        st.session_state["_animated"] = True
+        grid_class = "feature-grid first-load"
+    cards = "".join(_card_html(i, *feature) for i, feature in enumerate(_FEATURES))
+    st.html(f'<div class="{grid_class}">{cards}</div>')
     
-    # Load other pages (keeping original logic intact)
-    elif st.session_state.page == "chat":
-        try:
-            from pages.smart_chat import load_chat_page
-            load_chat_page()
-        except ImportError as e:
-            st.error(f"Error loading Smart Chat: {e}")
-            if st.button("🏠 Back to Home"):
-                st.session_state.page = "home"
-                st.rerun()
+    # Enhanced quick start section
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.markdown(_QUICKSTART_MD)
+    
+    with col2:
+        if st.button("🎯 Try Smart Chat", type="primary", use_container_width=True, key="try_chat_home"):
+            track_tool_usage("smart_chat", "page_visit")
+            st.session_state.page = "chat"
+            st.rerun()
+
+def main():
+    load_css()
     
-    elif st.session_state.page == "vision":
-        try:
-            from pages.vision_analysis import load_vision_page
-            load_vision_page()
-        except ImportError as e:
-            st.error(f"Error loading Vision Analysis: {e}")
-            if st.button("🏠 Back to Home"):
-                st.session_state.page = "home"
-                st.rerun()
+    # Enhanced main header with better structure
+    st.html(_HEADER_HTML)
     
-    elif st.session_state.page == "document":
-        try:
-            from pages.document_intelligence import load_document_intelligence_page
-            load_document_intelligence_page()
-        except ImportError as e:
-            st.error(f"Error loading Document Intelligence: {e}")
-            if st.button("🏠 Back to Home"):
-                st.session_state.page = "home"
-                st.rerun()
+    if "page" not in st.session_state:
+        st.session_state.page = "home"
     
-    elif st.session_state.page == "code":
-        try:
-            from pages.code_assistant import load_code_assistant_page
-            load_code_assistant_page()
-        except ImportError as e:
-            st.error(f"Error loading Code Assistant: {e}")
-            if st.button("🏠 Back to Home"):
-                st.session_state.page = "home"
-                st.rerun()
+    # Enhanced sidebar
+    with st.sidebar:
+        _sidebar()
     
-    elif st.session_state.page == "writer":
-        try:
-            from pages.creative_writer import load_creative_writer_page
-            load_creative_writer_page()
-        except ImportError as e:
-            st.error(f"Error loading Creative Writer: {e}")
-            if st.button("🏠 Back to Home"):
-                st.session_state.page = "home"
-                st.rerun()
+    # Enhanced home page
+    if st.session_state.page == "home":
+        _home()
     
-    elif st.session_state.page == "data":
-        try:
-            from pages.data_analyst import load_data_analyst_page
-            load_data_analyst_page()
-        except ImportError as e:
-            st.error(f"Error loading Data Analyst: {e}")
-            if st.button("🏠 Back to Home"):
-                st.session_state.page = "home"
-                st.rerun()
+    # Load other pages through the route table
+    elif st.session_state.page in _PAGES:
+        _dispatch(st.session_state.page)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
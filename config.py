@@ -1,30 +1,55 @@
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List
 
-load_dotenv()
+@lru_cache(maxsize=1)
+def _load_env():
+    """Parse .env exactly once per process, no matter how often config is imported"""
+    from dotenv import load_dotenv
+    load_dotenv()
 
+_load_env()
+
+@dataclass(frozen=True, slots=True)
 class Config:
     # API Keys
-    GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-    
+    GOOGLE_API_KEY: str = ""
+
     # App Settings
-    APP_NAME = os.getenv("APP_NAME", "GeminiCraft Studio")
-    APP_VERSION = os.getenv("APP_VERSION", "1.0.0")
-    DEBUG_MODE = os.getenv("DEBUG_MODE", "False").lower() == "true"
-    
+    APP_NAME: str = "GeminiCraft Studio"
+    APP_VERSION: str = "1.0.0"
+    DEBUG_MODE: bool = False
+
     # Model Settings
-    DEFAULT_MODEL = "gemini-1.5-pro"
-    MAX_TOKENS = 2048
-    TEMPERATURE = 0.7
-    
+    DEFAULT_MODEL: str = "gemini-1.5-pro"
+    MAX_TOKENS: int = 2048
+    TEMPERATURE: float = 0.7
+
     # File Settings
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-    ALLOWED_EXTENSIONS = ['.txt', '.pdf', '.docx', '.jpg', '.png', '.jpeg']
-    
+    MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    ALLOWED_EXTENSIONS: List[str] = field(
+        default_factory=lambda: ['.txt', '.pdf', '.docx', '.jpg', '.png', '.jpeg']
+    )
+
     # Database
-    DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///data/conversations.db")
-    
+    DATABASE_URL: str = "sqlite:///data/conversations.db"
+
     # UI Settings
-    THEME = "light"
-    PAGE_ICON = "🚀"
-    LAYOUT = "wide"
\ No newline at end of file
+    THEME: str = "light"
+    PAGE_ICON: str = "🚀"
+    LAYOUT: str = "wide"
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Build the config once from environment variables"""
+        return cls(
+            GOOGLE_API_KEY=os.getenv("GOOGLE_API_KEY", ""),
+            APP_NAME=os.getenv("APP_NAME", "GeminiCraft Studio"),
+            APP_VERSION=os.getenv("APP_VERSION", "1.0.0"),
+            DEBUG_MODE=os.getenv("DEBUG_MODE", "False").lower() == "true",
+            DATABASE_URL=os.getenv("DATABASE_URL", "sqlite:///data/conversations.db"),
+        )
+
+# Singleton instance: attribute reads are O(1) slot lookups
+CONFIG = Config.from_env()
@@ -1,197 +1,368 @@
 import streamlit as st
-import google.generativeai as genai
+import asyncio
+import hashlib
+import importlib
 import os
 import re
-import ast
+import io
 import json
-from datetime import datetime
-from typing import List, Dict, Optional
+import zipfile
+from collections import deque
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict
 
-# Import database utilities
-try:
-    from utils.database import track_tool_usage
-    DB_AVAILABLE = True
-except ImportError:
-    DB_AVAILABLE = False
+from utils.llm_cache import LLMCache
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+@lru_cache(maxsize=1)
+def _genai():
+    """Import google.generativeai on first model use.
+
+    The SDK drags in grpc/protobuf/auth (hundreds of ms of import time),
+    so sessions that only browse history never pay for it.
+    """
+    return importlib.import_module("google.generativeai")
+
+@lru_cache(maxsize=1)
+def _configure():
+    """Read GOOGLE_API_KEY and configure the SDK exactly once per process"""
+    _genai().configure(api_key=os.getenv("GOOGLE_API_KEY"))
+
+@lru_cache(maxsize=1)
+def _database_module():
+    """Import utils.database lazily; None when it is unavailable"""
+    try:
+        return importlib.import_module("utils.database")
+    except ImportError:
+        return None
+
+# Static instruction preambles per operation. These never change between
+# calls, so they are uploaded once to Gemini's explicit context cache and
+# each request ships only the dynamic code/description part.
+_PREAMBLES = {
+    "generate": """You generate code from requirements.
+
+Requirements:
+- Write clean, well-commented code
+- Follow best practices for the requested language
+- Include error handling where appropriate
+- Add docstrings/comments for functions
+- Make it production-ready
+
+Return only the code without explanations.""",
+
+    "debug": """You debug code and fix any issues.
+
+Please:
+1. Identify the issues
+2. Provide the corrected code
+3. Explain what was wrong and how you fixed it""",
+
+    "explain": """You explain code in detail.
+
+Please explain:
+- What the code does overall
+- How each major section works
+- Any algorithms or patterns used
+- Potential improvements or optimizations""",
+
+    "optimize": """You optimize code for better performance, readability, and maintainability.
+
+Please provide:
+1. Optimized version of the code
+2. Explanation of optimizations made
+3. Performance improvements expected
+4. Best practices applied""",
+
+    "review": """You perform comprehensive code reviews.
+
+Review criteria:
+- Code quality and readability
+- Security vulnerabilities
+- Performance issues
+- Best practices adherence
+- Potential bugs
+- Maintainability
+- Documentation quality
+
+Provide specific suggestions for improvement.""",
+
+    "tests": """You generate comprehensive unit tests for code.
+
+Requirements:
+- Cover all major functions/methods
+- Include edge cases and error conditions
+- Use the appropriate testing framework for the language
+- Add test descriptions and comments
+- Aim for high code coverage""",
+}
+
+# Dynamic prompt templates; the static instructions live in _PREAMBLES and
+# ride along as the (implicitly cacheable) system prefix. Field order runs
+# most-stable to most-variable — language, then style/error, then the free
+# user content dead last — so provider prefix caches get the longest
+# bit-identical run across calls. The code fence is deliberately
+# language-less: the "Language:" line already says it, and a bare fence
+# keeps the static text identical across languages.
+_GENERATE_PROMPT = "Language: {lang}\nStyle: {style}\n\nRequirement:\n{desc}"
+_DEBUG_PROMPT = (
+    "Language: {lang}\n"
+    "Error message (if any): {err}\n\n"
+    "Code:\n```\n{code}\n```"
+)
+_CODE_PROMPT = "Language: {lang}\n\nCode:\n```\n{code}\n```"
+
+@st.cache_resource
+def _get_operation_model(operation: str):
+    """Model with the operation's static preamble cached server-side.
+
+    Tries Gemini's explicit context cache first; falls back to a plain
+    model carrying the preamble as system_instruction when the cache
+    can't be created (e.g. preamble below the API's minimum token count).
+    """
+    preamble = _PREAMBLES[operation]
+    _configure()
+    genai = _genai()
+    try:
+        cached = genai.caching.CachedContent.create(
+            model="models/gemini-1.5-pro",
+            system_instruction=preamble,
+            ttl=timedelta(hours=1)
+        )
+        return genai.GenerativeModel.from_cached_content(cached)
+    except Exception:
+        return genai.GenerativeModel("gemini-1.5-pro", system_instruction=preamble)
+
+@st.cache_resource
+def _get_semantic_cache() -> LLMCache:
+    """One process-wide semantic cache shared by all sessions.
+
+    The shared LLMCache gives exact repeats a hash lookup and
+    near-duplicates ("Create a binary search algorithm" vs "Write
+    binary search in Python") a cosine match on their embeddings. The
+    operation and language are folded into the probe string so the
+    semantic tier doesn't cross-match between them.
+    """
+    _configure()
+    return LLMCache(max_entries=256)
+
+def _cache_probe(operation: str, language: str, text: str) -> str:
+    """One string carrying operation, language and content for both cache tiers"""
+    return f"{language} {operation}:\n{text}"
+
+@st.cache_resource
+def _get_models() -> Dict[str, object]:
+    """One model per operation, each carrying its preamble, built once per process"""
+    return {operation: _get_operation_model(operation) for operation in _PREAMBLES}
+
+@st.cache_resource
+def _get_code_assistant() -> "CodeAssistant":
+    """Process-wide CodeAssistant singleton (the class holds no per-user state)"""
+    return CodeAssistant()
 
 class CodeAssistant:
     def __init__(self):
-        self.model = genai.GenerativeModel("gemini-1.5-pro")
+        self._models = _get_models()
         self.supported_languages = [
             "Python", "JavaScript", "Java", "C++", "C#", "Go", "Rust", 
             "TypeScript", "PHP", "Ruby", "Swift", "Kotlin", "SQL", "HTML/CSS"
         ]
     
-    def generate_code(self, description: str, language: str, style: str = "clean") -> str:
-        """Generate code based on description"""
-        prompt = f"""
-        Generate {language} code for the following requirement:
-        {description}
-        
-        Style: {style}
-        Requirements:
-        - Write clean, well-commented code
-        - Follow best practices for {language}
-        - Include error handling where appropriate
-        - Add docstrings/comments for functions
-        - Make it production-ready
-        
-        Return only the code without explanations.
+    def _stream_response(self, model, prompt: str, placeholder=None) -> str:
+        """Collect a response, streaming partial text into the placeholder.
+
+        Without a placeholder this is a plain blocking call; with one the
+        user sees tokens from first-chunk time instead of staring at a
+        spinner for the whole generation.
         """
-        
+        if placeholder is None:
+            return model.generate_content(prompt).text
+
+        response = model.generate_content(prompt, stream=True)
+        buffer = ""
+        for chunk in response:
+            text = getattr(chunk, "text", "")
+            if not text:
+                continue
+            buffer += text
+            placeholder.markdown(buffer + "▌")
+        placeholder.markdown(buffer)
+        return buffer
+
+    def generate_code(self, description: str, language: str, style: str = "clean", placeholder=None) -> str:
+        """Generate code based on description"""
+        cache = _get_semantic_cache()
+        probe = _cache_probe("generate", language, description)
+        key = LLMCache.cache_key(probe)
+        cached = cache.get(key, probe)
+        if cached is not None:
+            return cached
+
+        prompt = _GENERATE_PROMPT.format(lang=language, style=style, desc=description)
+
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            text = self._stream_response(self._models["generate"], prompt, placeholder)
+            cache.set(key, probe, text)
+            return text
         except Exception as e:
             return f"Error generating code: {str(e)}"
     
-    def debug_code(self, code: str, error_message: str = "", language: str = "Python") -> str:
+    def debug_code(self, code: str, error_message: str = "", language: str = "Python", placeholder=None) -> str:
         """Debug and fix code issues"""
-        prompt = f"""
-        Debug this {language} code and fix any issues:
-        
-        Code:
-        ```{language.lower()}
-        {code}
-        ```
-        
-        Error message (if any): {error_message}
-        
-        Please:
-        1. Identify the issues
-        2. Provide the corrected code
-        3. Explain what was wrong and how you fixed it
-        """
+        prompt = _DEBUG_PROMPT.format(lang=language, err=error_message, code=code)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._stream_response(self._models["debug"], prompt, placeholder)
         except Exception as e:
             return f"Error debugging code: {str(e)}"
     
-    def explain_code(self, code: str, language: str = "Python") -> str:
+    def explain_code(self, code: str, language: str = "Python", placeholder=None) -> str:
         """Explain how code works"""
-        prompt = f"""
-        Explain this {language} code in detail:
-        
-        ```{language.lower()}
-        {code}
-        ```
-        
-        Please explain:
-        - What the code does overall
-        - How each major section works
-        - Any algorithms or patterns used
-        - Potential improvements or optimizations
-        """
-        
+        cache = _get_semantic_cache()
+        probe = _cache_probe("explain", language, code)
+        key = LLMCache.cache_key(probe)
+        cached = cache.get(key, probe)
+        if cached is not None:
+            return cached
+
+        prompt = _CODE_PROMPT.format(lang=language, code=code)
+
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            text = self._stream_response(self._models["explain"], prompt, placeholder)
+            cache.set(key, probe, text)
+            return text
         except Exception as e:
             return f"Error explaining code: {str(e)}"
     
-    def optimize_code(self, code: str, language: str = "Python") -> str:
+    def optimize_code(self, code: str, language: str = "Python", placeholder=None) -> str:
         """Optimize code for performance"""
-        prompt = f"""
-        Optimize this {language} code for better performance, readability, and maintainability:
-        
-        ```{language.lower()}
-        {code}
-        ```
-        
-        Please provide:
-        1. Optimized version of the code
-        2. Explanation of optimizations made
-        3. Performance improvements expected
-        4. Best practices applied
-        """
+        prompt = _CODE_PROMPT.format(lang=language, code=code)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._stream_response(self._models["optimize"], prompt, placeholder)
         except Exception as e:
             return f"Error optimizing code: {str(e)}"
     
-    def review_code(self, code: str, language: str = "Python") -> str:
+    def review_code(self, code: str, language: str = "Python", placeholder=None) -> str:
         """Perform code review"""
-        prompt = f"""
-        Perform a comprehensive code review for this {language} code:
-        
-        ```{language.lower()}
-        {code}
-        ```
-        
-        Review criteria:
-        - Code quality and readability
-        - Security vulnerabilities
-        - Performance issues
-        - Best practices adherence
-        - Potential bugs
-        - Maintainability
-        - Documentation quality
-        
-        Provide specific suggestions for improvement.
-        """
+        prompt = _CODE_PROMPT.format(lang=language, code=code)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._stream_response(self._models["review"], prompt, placeholder)
         except Exception as e:
             return f"Error reviewing code: {str(e)}"
     
-    def generate_tests(self, code: str, language: str = "Python") -> str:
+    def generate_tests(self, code: str, language: str = "Python", placeholder=None) -> str:
         """Generate unit tests for code"""
-        prompt = f"""
-        Generate comprehensive unit tests for this {language} code:
-        
-        ```{language.lower()}
-        {code}
-        ```
-        
-        Requirements:
-        - Cover all major functions/methods
-        - Include edge cases and error conditions
-        - Use appropriate testing framework for {language}
-        - Add test descriptions and comments
-        - Aim for high code coverage
-        """
+        prompt = _CODE_PROMPT.format(lang=language, code=code)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._stream_response(self._models["tests"], prompt, placeholder)
         except Exception as e:
             return f"Error generating tests: {str(e)}"
 
+    async def _combined_async(self, code: str, language: str):
+        """Fire the three independent analyses concurrently"""
+        prompt = _CODE_PROMPT.format(lang=language, code=code)
+        return await asyncio.gather(
+            self._models["review"].generate_content_async(prompt),
+            self._models["optimize"].generate_content_async(prompt),
+            self._models["tests"].generate_content_async(prompt),
+            return_exceptions=True
+        )
+
+    def combined_analysis(self, code: str, language: str = "Python") -> Dict[str, str]:
+        """Run review, optimization and test generation in parallel.
+
+        Wall-clock time is max of the three calls instead of their sum.
+        """
+        results = asyncio.run(self._combined_async(code, language))
+        combined = {}
+        for name, result in zip(["Code Review", "Optimization", "Unit Tests"], results):
+            if isinstance(result, Exception):
+                combined[name] = f"Error: {str(result)}"
+            else:
+                combined[name] = result.text
+        return combined
+
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?\n(.*?)\n```', re.DOTALL)
+
+# Download filename extensions by code-block language
+_EXT_MAP = {
+    "python": "py", "javascript": "js", "java": "java",
+    "cpp": "cpp", "csharp": "cs", "go": "go",
+    "rust": "rs", "typescript": "ts", "php": "php",
+    "ruby": "rb", "swift": "swift", "kotlin": "kt",
+    "sql": "sql", "html": "html", "css": "css"
+}
+
+@lru_cache(maxsize=128)
+def _extract_code_blocks_cached(text: str) -> tuple:
+    """Tokenize once per unique response; history re-renders hit the cache"""
+    return tuple(
+        {"id": i, "language": m.group(1) or "text", "code": m.group(2).strip()}
+        for i, m in enumerate(_CODE_BLOCK_RE.finditer(text))
+    )
+
 def extract_code_blocks(text: str) -> List[Dict[str, str]]:
     """Extract code blocks from text"""
-    code_pattern = r'```(\w+)?\n(.*?)\n```'
-    matches = re.findall(code_pattern, text, re.DOTALL)
-    
-    code_blocks = []
-    for i, match in enumerate(matches):
-        language = match[0] if match[0] else "text"
-        code = match[1].strip()
-        code_blocks.append({
-            "id": i,
-            "language": language,
-            "code": code
-        })
-    
-    return code_blocks
+    # C-level substring check beats starting the regex engine at all
+    if not text or "```" not in text:
+        return []
+    return list(_extract_code_blocks_cached(text))
+
+class _GenerationError(Exception):
+    """Raised out of _cached_call so st.cache_data never memoizes failures"""
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_call(operation: str, language: str, payload_hash: str,
+                 _payload: str, _style: str, _error_message: str,
+                 _placeholder=None) -> str:
+    """Exact-repeat memo in front of the model call, shared across sessions.
+
+    Keyed on (operation, language, content hash) — an O(1) lookup that
+    short-circuits before the semantic cache's cosine scan. Underscored
+    args are excluded from the key; on a miss the call still streams
+    into the placeholder. Error responses are raised rather than
+    returned so a transient API failure isn't replayed for the TTL.
+    """
+    assistant = _get_code_assistant()
+    if operation == "Generate Code":
+        result = assistant.generate_code(_payload, language, _style, _placeholder)
+    elif operation == "Debug Code":
+        result = assistant.debug_code(_payload, _error_message, language, _placeholder)
+    elif operation == "Explain Code":
+        result = assistant.explain_code(_payload, language, _placeholder)
+    elif operation == "Optimize Code":
+        result = assistant.optimize_code(_payload, language, _placeholder)
+    elif operation == "Code Review":
+        result = assistant.review_code(_payload, language, _placeholder)
+    else:
+        result = assistant.generate_tests(_payload, language, _placeholder)
+    if result.startswith("Error "):
+        raise _GenerationError(result)
+    return result
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _zip_code_blocks(result: str) -> bytes:
+    """Bundle every code block in a response into one zip, built once per response"""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        for block in extract_code_blocks(result):
+            ext = _EXT_MAP.get(block["language"].lower(), "txt")
+            archive.writestr(f"block_{block['id']}.{ext}", block["code"])
+    return buf.getvalue()
 
 def load_code_assistant_page():
     st.markdown("# 💻 Code Assistant")
     st.markdown("*Your AI-powered programming companion for code generation, debugging, and optimization*")
     
     # Initialize session state
-    if "code_assistant" not in st.session_state:
-        st.session_state.code_assistant = CodeAssistant()
+    assistant = _get_code_assistant()
     if "code_history" not in st.session_state:
-        st.session_state.code_history = []
+        # Bounded: long sessions keep at most the 50 most recent operations
+        st.session_state.code_history = deque(maxlen=50)
     
     # Sidebar controls
     with st.sidebar:
@@ -200,7 +371,7 @@ def load_code_assistant_page():
         # Language selection
         language = st.selectbox(
             "🔤 Programming Language:",
-            st.session_state.code_assistant.supported_languages,
+            assistant.supported_languages,
             index=0
         )
         
@@ -219,7 +390,8 @@ def load_code_assistant_page():
                 "Explain Code",
                 "Optimize Code",
                 "Code Review",
-                "Generate Tests"
+                "Generate Tests",
+                "Combined Analysis"
             ]
         )
         
@@ -244,15 +416,17 @@ def load_code_assistant_page():
         
         # History management
         if st.button("🗑️ Clear History", use_container_width=True):
-            st.session_state.code_history = []
+            st.session_state.code_history.clear()
+            st.session_state.pop("_history_blocks_cache", None)
             st.rerun()
         
         if st.session_state.code_history:
             if st.button("💾 Export History", use_container_width=True):
+                # Serialized only on click, never on ordinary reruns
                 history_data = {
                     "timestamp": datetime.now().isoformat(),
                     "language": language,
-                    "operations": st.session_state.code_history
+                    "operations": list(st.session_state.code_history)
                 }
                 st.download_button(
                     label="📥 Download JSON",
@@ -275,86 +449,98 @@ def load_code_assistant_page():
         
         user_input = ""
         uploaded_code = ""
-        
-        if input_method == "Text Description":
-            user_input = st.text_area(
-                f"Describe what you want to {operation.lower()}:",
-                placeholder="e.g., Create a function that sorts a list of dictionaries by a specific key...",
-                height=150,
-                key="code_description"
-            )
+
+        # Batch the input widgets: tweaking them queues state locally and
+        # the script reruns once, on submit
+        with st.form("code_input_form"):
+            if input_method == "Text Description":
+                user_input = st.text_area(
+                    f"Describe what you want to {operation.lower()}:",
+                    placeholder="e.g., Create a function that sorts a list of dictionaries by a specific key...",
+                    height=150,
+                    key="code_description"
+                )
             
-            # Check for template prompt
-            if "template_prompt" in st.session_state:
-                st.text_area(
-                    "Template loaded:",
-                    value=st.session_state.template_prompt,
-                    height=50,
-                    disabled=True
+                # Check for template prompt
+                if "template_prompt" in st.session_state:
+                    st.text_area(
+                        "Template loaded:",
+                        value=st.session_state.template_prompt,
+                        height=50,
+                        disabled=True
+                    )
+                    user_input = st.session_state.template_prompt
+                    del st.session_state.template_prompt
+
+            elif input_method == "Code Upload":
+                uploaded_file = st.file_uploader(
+                    "Upload code file",
+                    type=["py", "js", "java", "cpp", "cs", "go", "rs", "ts", "php", "rb", "swift", "kt", "sql", "html", "css"]
                 )
-                user_input = st.session_state.template_prompt
-                del st.session_state.template_prompt
-        
-        elif input_method == "Code Upload":
-            uploaded_file = st.file_uploader(
-                "Upload code file",
-                type=["py", "js", "java", "cpp", "cs", "go", "rs", "ts", "php", "rb", "swift", "kt", "sql", "html", "css"]
-            )
-            if uploaded_file:
-                uploaded_code = str(uploaded_file.read(), "utf-8")
-                st.code(uploaded_code[:500] + "..." if len(uploaded_code) > 500 else uploaded_code)
-        
-        elif input_method == "Code Paste":
-            uploaded_code = st.text_area(
-                "Paste your code here:",
-                placeholder="Paste your code for debugging, explanation, or optimization...",
-                height=200
-            )
-        
-        # Error message for debugging
-        error_message = ""
-        if operation == "Debug Code":
-            error_message = st.text_area(
-                "Error message (optional):",
-                placeholder="Paste any error messages you're getting...",
-                height=100
-            )
-        
-        # Process button
-        if st.button("🚀 Process Code", type="primary", use_container_width=True):
-            if (operation == "Generate Code" and user_input) or (operation != "Generate Code" and uploaded_code):
+                if uploaded_file:
+                    # Decode once per upload; reruns reuse the session_state copy
+                    if st.session_state.get("_uploaded_file_id") != uploaded_file.file_id:
+                        st.session_state._uploaded_code = uploaded_file.read().decode("utf-8")
+                        st.session_state._uploaded_file_id = uploaded_file.file_id
+                    uploaded_code = st.session_state._uploaded_code
+                    if len(uploaded_code) > 500:
+                        st.code(uploaded_code[:500] + "...")
+                    else:
+                        st.code(uploaded_code)
+
+            elif input_method == "Code Paste":
+                uploaded_code = st.text_area(
+                    "Paste your code here:",
+                    placeholder="Paste your code for debugging, explanation, or optimization...",
+                    height=200
+                )
+
+            # Error message for debugging
+            error_message = ""
+            if operation == "Debug Code":
+                error_message = st.text_area(
+                    "Error message (optional):",
+                    placeholder="Paste any error messages you're getting...",
+                    height=100
+                )
+
+            # Process button
+            submitted = st.form_submit_button("🚀 Process Code", type="primary", use_container_width=True)
+
+        if submitted:
+            if (operation == "Generate Code" and user_input.strip()) or (operation != "Generate Code" and uploaded_code.strip()):
                 # Track usage
-                if DB_AVAILABLE:
-                    track_tool_usage("code_assistant", f"operation_{operation.lower().replace(' ', '_')}")
+                db = _database_module()
+                if db is not None:
+                    db.track_tool_usage("code_assistant", f"operation_{operation.lower().replace(' ', '_')}")
                 
+                # Stream partial output into the output column as it arrives
+                placeholder = col2.empty()
+
                 with st.spinner(f"🔄 {operation}..."):
-                    
-                    result = ""
-                    if operation == "Generate Code":
-                        result = st.session_state.code_assistant.generate_code(
-                            user_input, language, code_style.lower()
-                        )
-                    elif operation == "Debug Code":
-                        result = st.session_state.code_assistant.debug_code(
-                            uploaded_code, error_message, language
-                        )
-                    elif operation == "Explain Code":
-                        result = st.session_state.code_assistant.explain_code(
-                            uploaded_code, language
-                        )
-                    elif operation == "Optimize Code":
-                        result = st.session_state.code_assistant.optimize_code(
-                            uploaded_code, language
-                        )
-                    elif operation == "Code Review":
-                        result = st.session_state.code_assistant.review_code(
-                            uploaded_code, language
-                        )
-                    elif operation == "Generate Tests":
-                        result = st.session_state.code_assistant.generate_tests(
+
+                    if operation == "Combined Analysis":
+                        # Review + Optimize + Tests run concurrently
+                        result = assistant.combined_analysis(
                             uploaded_code, language
                         )
-                    
+                    else:
+                        payload = user_input if operation == "Generate Code" else uploaded_code
+                        payload_hash = hashlib.sha1(
+                            f"{payload}\x00{code_style}\x00{error_message}".encode()
+                        ).hexdigest()
+                        try:
+                            result = _cached_call(
+                                operation, language, payload_hash,
+                                payload, code_style.lower(), error_message, placeholder
+                            )
+                        except _GenerationError as e:
+                            result = str(e)
+
+                    # The output column below renders the final result, so
+                    # drop the streaming scratch copy to avoid showing it twice
+                    placeholder.empty()
+
                     # Store result in session state for display in col2
                     st.session_state.current_result = result
                     
@@ -363,12 +549,12 @@ def load_code_assistant_page():
                         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                         "operation": operation,
                         "language": language,
-                        "input": user_input if user_input else uploaded_code[:200] + "...",
-                        "result": result
+                        "input": user_input or uploaded_code,
+                        "result": result if isinstance(result, str) else "\n\n".join(
+                            f"## {name}\n\n{section}" for name, section in result.items()
+                        )
                     }
                     st.session_state.code_history.append(history_record)
-                    
-                    st.rerun()
             else:
                 st.error("Please provide input for the selected operation.")
     
@@ -377,40 +563,46 @@ def load_code_assistant_page():
         
         if "current_result" in st.session_state:
             result = st.session_state.current_result
-            
-            # Extract and display code blocks
-            code_blocks = extract_code_blocks(result)
+
+            if isinstance(result, dict):
+                # Combined Analysis: one tab per parallel result
+                tabs = st.tabs(list(result.keys()))
+                for tab, section in zip(tabs, result.values()):
+                    with tab:
+                        section_blocks = extract_code_blocks(section)
+                        if section_blocks:
+                            for block in section_blocks:
+                                st.code(block["code"], language=block["language"])
+                        st.write(section)
+                result = "\n\n".join(
+                    f"## {name}\n\n{section}" for name, section in result.items()
+                )
+                code_blocks = []
+                show_full_response = False
+            else:
+                # Extract and display code blocks
+                code_blocks = extract_code_blocks(result)
+                show_full_response = True
             
             if code_blocks:
                 st.markdown("**🎯 Generated Code:**")
                 for block in code_blocks:
                     st.code(block["code"], language=block["language"])
-                    
-                    # Action buttons for each code block
-                    col_copy, col_download = st.columns(2)
-                    with col_copy:
-                        if st.button(f"📋 Copy", key=f"copy_{block['id']}"):
-                            st.success("Code copied!")
-                    with col_download:
-                        file_extension = {
-                            "python": "py", "javascript": "js", "java": "java",
-                            "cpp": "cpp", "csharp": "cs", "go": "go",
-                            "rust": "rs", "typescript": "ts", "php": "php",
-                            "ruby": "rb", "swift": "swift", "kotlin": "kt",
-                            "sql": "sql", "html": "html", "css": "css"
-                        }.get(block["language"].lower(), "txt")
-                        
-                        st.download_button(
-                            label="💾 Download",
-                            data=block["code"],
-                            file_name=f"generated_code_{block['id']}.{file_extension}",
-                            mime="text/plain",
-                            key=f"download_{block['id']}"
-                        )
+
+                # One widget for all blocks instead of two per block;
+                # the archive itself is cached per response
+                st.download_button(
+                    label="💾 Download All Code Blocks (.zip)",
+                    data=_zip_code_blocks(result),
+                    file_name=f"code_blocks_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                    mime="application/zip",
+                    use_container_width=True
+                )
             
-            # Display full response
-            st.markdown("**📋 Full Response:**")
-            st.write(result)
+            # Display full response (tabs already show it for Combined Analysis)
+            if show_full_response:
+                st.markdown("**📋 Full Response:**")
+                st.write(result)
             
             # Overall action buttons
             col_copy_all, col_save_all = st.columns(2)
@@ -462,18 +654,34 @@ def load_code_assistant_page():
         st.markdown("---")
         st.markdown("## 📚 Code History")
         
-        for i, record in enumerate(reversed(st.session_state.code_history[-5:])):  # Show last 5
+        blocks_cache = st.session_state.setdefault("_history_blocks_cache", {})
+        shown_keys = set()
+        for i, record in enumerate(islice(reversed(st.session_state.code_history), 5)):  # Show last 5
             with st.expander(f"💻 {record['operation']} ({record['language']}) - {record['timestamp']}"):
-                st.markdown(f"**Input:** {record['input']}")
+                # Full input is stored; the preview is sliced lazily here
+                preview = record['input']
+                if len(preview) > 200:
+                    preview = preview[:200] + "…"
+                st.markdown(f"**Input:** {preview}")
                 st.markdown(f"**Result:**")
-                
-                # Extract and display code blocks from history
-                history_blocks = extract_code_blocks(record['result'])
+
+                # History records are immutable once appended, so their
+                # extraction is computed once per result and reused on
+                # reruns. Keyed on the result's content hash — id() keys
+                # can be recycled after deque eviction.
+                key = hashlib.sha1(record['result'].encode()).hexdigest()
+                shown_keys.add(key)
+                if key not in blocks_cache:
+                    blocks_cache[key] = extract_code_blocks(record['result'])
+                history_blocks = blocks_cache[key]
                 if history_blocks:
                     for block in history_blocks:
                         st.code(block["code"], language=block["language"])
                 else:
                     st.write(record['result'])
+        # Drop entries for records that scrolled out of the displayed window
+        for stale in set(blocks_cache) - shown_keys:
+            del blocks_cache[stale]
 
 # This would be called from the main app
 if __name__ == "__main__":
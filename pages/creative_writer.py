@@ -1,10 +1,25 @@
 import streamlit as st
-import google.generativeai as genai
+import asyncio
+import hashlib
+import importlib
 import os
 import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache, partial, wraps
+from itertools import islice
+from string import Template
 from datetime import datetime
 from typing import List, Dict, Optional
 
+# orjson (Rust) serializes dicts-of-strings several times faster than
+# stdlib json; fall back silently when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import database utilities
 try:
     from utils.database import track_tool_usage
@@ -12,12 +27,150 @@ try:
 except ImportError:
     DB_AVAILABLE = False
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+from utils.llm_cache import get_llm_cache
+from utils.text_stats import history_stats
+
+@lru_cache(maxsize=1)
+def _genai():
+    """Import and configure google.generativeai on first model use"""
+    genai = importlib.import_module("google.generativeai")
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    return genai
+
+@st.cache_resource
+def _get_model(name: str = "gemini-1.5-pro"):
+    """One GenerativeModel per process instead of one per session"""
+    return _genai().GenerativeModel(name)
+
+@lru_cache(maxsize=256)
+def _call_model(model_name: str, prompt: str) -> str:
+    """Deterministic-call guard for analytical operations.
+
+    Temperature is pinned to 0 so the same prompt always maps to the
+    same answer, making an exact lru_cache hit safe and free. Module
+    level on purpose: instances must not leak into the cache key.
+    """
+    return _get_model(model_name).generate_content(
+        prompt, generation_config={"temperature": 0}
+    ).text
+
+
+# Static prompt scaffolds, built once at import; per-call work is just the
+# Template substitution
+_PROMPTS = {
+    "generate": Template("""
+        Create a $content_type_lower on the topic: "$topic"
+        
+        Requirements:
+        - Writing style: $style
+        - Tone: $tone
+        - Target word count: $word_count words
+        - Content type: $content_type
+        
+        Additional requirements: $additional_requirements
+        
+        Guidelines:
+        - Make it engaging and well-structured
+        - Use appropriate formatting for the content type
+        - Include a compelling opening and strong conclusion
+        - Ensure the content matches the specified style and tone
+        - Make it original and creative
+        """),
+    "improve": Template("""
+        $instruction
+        
+        Original content:
+        $content
+        
+        Please provide the improved version.
+        """),
+    "ideas": Template("""
+        Generate $count creative and engaging ideas for $content_type_lower content about "$topic".
+        
+        For each idea, provide:
+        1. A catchy title/headline
+        2. A brief description of the content
+        3. Key points to cover
+        
+        Make the ideas diverse, unique, and engaging.
+        """),
+    "outline": Template("""
+        Create a detailed outline for a $content_type_lower about "$topic".
+        Target length: $target_length
+        
+        Include:
+        - Introduction/hook
+        - Main sections with subsections
+        - Key points for each section
+        - Conclusion
+        - Suggested word count for each section
+        
+        Make it comprehensive and well-structured.
+        """),
+    "analyze": Template("""
+        Analyze this content and provide insights on:
+        
+        1. Readability level and clarity
+        2. Tone and style assessment
+        3. Strengths and weaknesses
+        4. Target audience suitability
+        5. Engagement potential
+        6. Suggestions for improvement
+        7. Overall effectiveness rating (1-10)
+        
+        Content to analyze:
+        $content
+        """),
+}
+
+_IMPROVEMENT_PROMPTS = {
+    "Grammar & Style": "Improve the grammar, style, and readability of this content while maintaining its original meaning and tone.",
+    "Make More Engaging": "Rewrite this content to make it more engaging, compelling, and interesting to read.",
+    "Shorten": "Condense this content to make it more concise while keeping all key points.",
+    "Expand": "Expand this content with more details, examples, and elaboration.",
+    "Change Tone": "Rewrite this content with a more professional and polished tone.",
+    "Add SEO": "Optimize this content for search engines by adding relevant keywords naturally."
+}
+
+def _cached_flash_call(label: str, deterministic: bool = True):
+    """Shared fetch/cache/error path for the short flash-tier operations.
+
+    The wrapped method only builds its prompt; one copy of the cache
+    lookup, model call and error formatting replaces a body repeated per
+    method. Deterministic operations go through the temperature-pinned
+    lru guard; sampling ones call the model directly.
+    """
+    def decorator(build_prompt):
+        @wraps(build_prompt)
+        def wrapper(self, *args, **kwargs):
+            prompt = build_prompt(self, *args, **kwargs)
+            cache = get_llm_cache()
+            key = cache.cache_key(prompt)
+            if (hit := cache.get(key, prompt)) is not None:
+                return hit
+            try:
+                if deterministic:
+                    text = _call_model(self._model_name_for("flash"), prompt)
+                else:
+                    text = self._model_for("flash").generate_content(prompt).text
+                cache.set(key, prompt, text)
+                return text
+            except Exception as e:
+                return f"Error {label}: {str(e)}"
+        return wrapper
+    return decorator
+
+@st.cache_resource
+def get_creative_writer() -> "CreativeWriter":
+    """Process-wide CreativeWriter shared across sessions.
+
+    The instance holds only constants and process-wide clients; per-user
+    state (history, overrides) stays in st.session_state.
+    """
+    return CreativeWriter()
 
 class CreativeWriter:
     def __init__(self):
-        self.model = genai.GenerativeModel("gemini-1.5-pro")
         self.content_types = [
             "Short Story", "Blog Post", "Marketing Copy", "Technical Article", 
             "Social Media Post", "Email", "Product Description", "Press Release",
@@ -32,6 +185,82 @@ class CreativeWriter:
             "Authoritative", "Conversational", "Urgent", "Calm", "Playful"
         ]
     
+    @cached_property
+    def models(self):
+        """SDK clients created lazily, shared via the process-wide resource.
+
+        Ideation/outline/analysis are short, low-creativity tasks where
+        flash is ~5x faster and far cheaper at comparable quality.
+        """
+        return {
+            "pro": _get_model("gemini-1.5-pro"),
+            "flash": _get_model("gemini-1.5-flash"),
+        }
+    
+    @property
+    def model(self):
+        return self.models["pro"]
+    
+    @staticmethod
+    def _force_pro() -> bool:
+        """Per-user override lives in session_state, not on the shared instance"""
+        try:
+            return bool(st.session_state.get("force_pro", False))
+        except Exception:
+            # Background threads have no session; default to the tier routing
+            return False
+    
+    def _model_for(self, tier: str):
+        """Resolve the model tier, honoring the user's force-pro override"""
+        if self._force_pro():
+            return self.models["pro"]
+        return self.models[tier]
+    
+    def _model_name_for(self, tier: str) -> str:
+        if tier == "pro" or self._force_pro():
+            return "gemini-1.5-pro"
+        return "gemini-1.5-flash"
+    
+    def _content_prompt(
+        self,
+        content_type: str,
+        topic: str,
+        style: str,
+        tone: str,
+        word_count: int,
+        additional_requirements: str = ""
+    ) -> str:
+        """Build the generation prompt (shared by single and batch paths)"""
+        return _PROMPTS["generate"].substitute(
+            content_type_lower=content_type.lower(),
+            content_type=content_type,
+            topic=topic,
+            style=style,
+            tone=tone,
+            word_count=word_count,
+            additional_requirements=additional_requirements
+        )
+    
+    def _ideas_prompt(self, topic: str, content_type: str, count: int = 10) -> str:
+        """Build the ideas prompt (shared by single and batch paths)"""
+        return _PROMPTS["ideas"].substitute(
+            count=count, content_type_lower=content_type.lower(), topic=topic
+        )
+    
+    def _stream_chunks(self, prompt: str, key: str):
+        """Yield response text as it arrives; cache the full text at the end"""
+        try:
+            response = self.model.generate_content(prompt, stream=True)
+            collected = []
+            for chunk in response:
+                text = getattr(chunk, "text", "")
+                if text:
+                    collected.append(text)
+                    yield text
+            get_llm_cache().set(key, prompt, "".join(collected))
+        except Exception as e:
+            yield f"Error generating content: {str(e)}"
+    
     def generate_content(
         self, 
         content_type: str, 
@@ -39,138 +268,294 @@ class CreativeWriter:
         style: str, 
         tone: str, 
         word_count: int,
-        additional_requirements: str = ""
-    ) -> str:
-        """Generate creative content based on parameters"""
-        
-        prompt = f"""
-        Create a {content_type.lower()} on the topic: "{topic}"
-        
-        Requirements:
-        - Writing style: {style}
-        - Tone: {tone}
-        - Target word count: {word_count} words
-        - Content type: {content_type}
-        
-        Additional requirements: {additional_requirements}
-        
-        Guidelines:
-        - Make it engaging and well-structured
-        - Use appropriate formatting for the content type
-        - Include a compelling opening and strong conclusion
-        - Ensure the content matches the specified style and tone
-        - Make it original and creative
+        additional_requirements: str = "",
+        stream: bool = False
+    ):
+        """Generate creative content based on parameters.
+
+        With stream=True an iterator of text chunks is returned (cache
+        hits come back as a single-chunk iterator) for st.write_stream.
         """
         
+        prompt = self._content_prompt(
+            content_type, topic, style, tone, word_count, additional_requirements
+        )
+        
+        cache = get_llm_cache()
+        key = cache.cache_key(prompt)
+        hit = cache.get(key, prompt)
+        if stream:
+            if hit is not None:
+                return iter([hit])
+            return self._stream_chunks(prompt, key)
+        if hit is not None:
+            return hit
+
         try:
             response = self.model.generate_content(prompt)
+            cache.set(key, prompt, response.text)
             return response.text
         except Exception as e:
             return f"Error generating content: {str(e)}"
     
-    def improve_content(self, content: str, improvement_type: str) -> str:
+    def improve_content(self, content: str, improvement_type: str, stream: bool = False):
         """Improve existing content"""
         
-        improvement_prompts = {
-            "Grammar & Style": "Improve the grammar, style, and readability of this content while maintaining its original meaning and tone.",
-            "Make More Engaging": "Rewrite this content to make it more engaging, compelling, and interesting to read.",
-            "Shorten": "Condense this content to make it more concise while keeping all key points.",
-            "Expand": "Expand this content with more details, examples, and elaboration.",
-            "Change Tone": "Rewrite this content with a more professional and polished tone.",
-            "Add SEO": "Optimize this content for search engines by adding relevant keywords naturally."
-        }
-        
-        prompt = f"""
-        {improvement_prompts.get(improvement_type, 'Improve this content:')}
-        
-        Original content:
-        {content}
-        
-        Please provide the improved version.
-        """
+        prompt = _PROMPTS["improve"].substitute(
+            instruction=_IMPROVEMENT_PROMPTS.get(improvement_type, 'Improve this content:'),
+            content=content
+        )
         
+        cache = get_llm_cache()
+        key = cache.cache_key(prompt)
+        hit = cache.get(key, prompt)
+        if stream:
+            if hit is not None:
+                return iter([hit])
+            return self._stream_chunks(prompt, key)
+        if hit is not None:
+            return hit
+
         try:
             response = self.model.generate_content(prompt)
+            cache.set(key, prompt, response.text)
             return response.text
         except Exception as e:
             return f"Error improving content: {str(e)}"
     
+    @_cached_flash_call("generating ideas", deterministic=False)
     def generate_ideas(self, topic: str, content_type: str, count: int = 10) -> str:
         """Generate content ideas"""
-        
-        prompt = f"""
-        Generate {count} creative and engaging ideas for {content_type.lower()} content about "{topic}".
-        
-        For each idea, provide:
-        1. A catchy title/headline
-        2. A brief description of the content
-        3. Key points to cover
-        
-        Make the ideas diverse, unique, and engaging.
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error generating ideas: {str(e)}"
+        return self._ideas_prompt(topic, content_type, count)
     
+    @_cached_flash_call("creating outline")
     def create_outline(self, topic: str, content_type: str, target_length: str) -> str:
         """Create content outline"""
-        
-        prompt = f"""
-        Create a detailed outline for a {content_type.lower()} about "{topic}".
-        Target length: {target_length}
-        
-        Include:
-        - Introduction/hook
-        - Main sections with subsections
-        - Key points for each section
-        - Conclusion
-        - Suggested word count for each section
-        
-        Make it comprehensive and well-structured.
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error creating outline: {str(e)}"
+        return _PROMPTS["outline"].substitute(
+            content_type_lower=content_type.lower(), topic=topic, target_length=target_length
+        )
     
+    @_cached_flash_call("analyzing content")
     def analyze_content(self, content: str) -> str:
         """Analyze content for readability, tone, and effectiveness"""
-        
-        prompt = f"""
-        Analyze this content and provide insights on:
-        
-        1. Readability level and clarity
-        2. Tone and style assessment
-        3. Strengths and weaknesses
-        4. Target audience suitability
-        5. Engagement potential
-        6. Suggestions for improvement
-        7. Overall effectiveness rating (1-10)
-        
-        Content to analyze:
-        {content}
-        """
-        
+        return _PROMPTS["analyze"].substitute(content=content)
+    
+    async def _generate_async(self, prompt: str, tier: str = "pro") -> str:
+        """Awaitable model call; lets independent prompts overlap"""
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._model_for(tier).generate_content_async(prompt)
             return response.text
         except Exception as e:
-            return f"Error analyzing content: {str(e)}"
+            return f"Error generating content: {str(e)}"
+    
+    def compose_and_analyze(
+        self,
+        content_type: str,
+        topic: str,
+        style: str,
+        tone: str,
+        word_count: int,
+        existing_content: str,
+        additional_requirements: str = ""
+    ):
+        """Generate new content while analyzing an existing draft in parallel.
+
+        The two calls are independent, so gather makes the pair cost
+        max(two calls) wall-clock instead of their sum.
+        """
+        async def _run():
+            return await asyncio.gather(
+                self._generate_async(self._content_prompt(
+                    content_type, topic, style, tone, word_count, additional_requirements
+                )),
+                self._generate_async(
+                    _PROMPTS["analyze"].substitute(content=existing_content), "flash"
+                ),
+            )
+        return asyncio.run(_run())
+    
+    # At most 4 in-flight requests, sized to the Gemini QPS quota so a
+    # large queue doesn't trip 429s
+    _request_gate = threading.BoundedSemaphore(4)
+    
+    def _generate_one(self, prompt: str) -> str:
+        with self._request_gate:
+            try:
+                return self.model.generate_content(prompt).text
+            except Exception as e:
+                return f"Error generating content: {str(e)}"
+    
+    def generate_many(self, prompts: List[str]) -> List[str]:
+        """Overlap independent prompts' network latency with a thread pool.
+
+        Threads sidestep event-loop ownership issues inside Streamlit's
+        script thread; wall time is max(one call) rather than sum.
+        """
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            return list(executor.map(self._generate_one, prompts))
+    
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Run independent prompts concurrently instead of serially"""
+        return self.generate_many(prompts)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _content_metrics(text: str) -> Dict[str, int]:
+    """Word/sentence/paragraph counts, computed once per unique result.
+
+    Reruns fire on every widget interaction, so without this the full
+    result string is re-scanned each time.
+    """
+    # Memoization already removes the per-rerun cost, so the word count
+    # stays exact — counting spaces misses newline-separated words in
+    # ordinary markdown (lists, headings)
+    return {
+        "words": len(text.split()),
+        "sentences": text.count('.'),
+        "paragraphs": text.count('\n\n') + 1,
+    }
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _history_export(keys: tuple, _records: list) -> str:
+    """Indented-JSON export blob, re-serialized only when history changes"""
+    history_data = {
+        "timestamp": datetime.now().isoformat(),
+        "writings": _records
+    }
+    if orjson is not None:
+        # bytes are fine: st.download_button accepts them directly
+        return orjson.dumps(history_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(history_data, indent=2)
+
+def _history_key(record: Dict) -> tuple:
+    """Dedup identity for a history record"""
+    return (
+        record["operation"], record["topic"], record["content_type"],
+        hashlib.sha256(record["result"].encode()).hexdigest()
+    )
+
+def _push_history(record: Dict):
+    """Append unless an identical record exists; history stays capped.
+
+    Quick-action spam produces byte-identical results (cache hits), so
+    duplicates are skipped instead of crowding out distinct entries.
+    """
+    keys = st.session_state.setdefault("history_keys", set())
+    key = _history_key(record)
+    if key in keys:
+        return
+    history = st.session_state.writing_history
+    if history.maxlen and len(history) == history.maxlen:
+        keys.discard(_history_key(history[0]))
+    keys.add(key)
+    # Preview computed once at append time, not on every render
+    result = record["result"]
+    record["_preview"] = result[:500] + "..." if len(result) > 500 else result
+    history.append(record)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _history_stats(results: tuple) -> dict:
+    """Memoized aggregate stats; recomputed only when history changes"""
+    return history_stats(results)
+
+# Sidebar template settings; static, so built once at import
+_TEMPLATES = {
+    "Product Launch": {
+        "type": "Marketing Copy",
+        "topic": "New product launch announcement",
+        "style": "Persuasive",
+        "tone": "Enthusiastic"
+    },
+    "Company Blog": {
+        "type": "Blog Post", 
+        "topic": "Industry trends and insights",
+        "style": "Professional",
+        "tone": "Informative"
+    },
+    "Social Media": {
+        "type": "Social Media Post",
+        "topic": "Engaging social media content",
+        "style": "Casual",
+        "tone": "Friendly"
+    },
+    "Technical Guide": {
+        "type": "Technical Article",
+        "topic": "How-to guide for developers",
+        "style": "Technical",
+        "tone": "Authoritative"
+    }
+}
+
+# Example prompts for the empty output column
+_CONTENT_EXAMPLES = {
+    "Blog Post": [
+        "Industry trends and predictions",
+        "How-to guides and tutorials",
+        "Case studies and success stories",
+        "Expert interviews and insights"
+    ],
+    "Marketing Copy": [
+        "Product launch announcements",
+        "Email marketing campaigns", 
+        "Landing page copy",
+        "Social media advertisements"
+    ],
+    "Technical Article": [
+        "API documentation",
+        "Software tutorials",
+        "Best practices guides",
+        "Technology comparisons"
+    ]
+}
+
+# Quick-action prompt builders specialized at import for their fixed
+# settings; a click just applies the partial to topic/word_count
+_QUICK_PROMPTS = {
+    "Blog Post": partial(CreativeWriter._content_prompt,
+                         content_type="Blog Post", style="Professional", tone="Informative"),
+    "Social Media Post": partial(CreativeWriter._content_prompt,
+                                 content_type="Social Media Post", style="Casual", tone="Engaging"),
+    "Email Template": partial(CreativeWriter._content_prompt,
+                              content_type="Email", style="Professional", tone="Friendly"),
+    "Content Ideas": partial(CreativeWriter._ideas_prompt, content_type="Blog Post"),
+}
+
+@st.cache_resource
+def _prefetch_executor() -> ThreadPoolExecutor:
+    """Single background worker for speculative generations"""
+    return ThreadPoolExecutor(max_workers=1)
+
+@st.fragment
+def _render_history_row(record: Dict, i: int):
+    """One history row; widget clicks rerun only this fragment"""
+    with st.expander(f"✍️ {record['operation']} - {record['content_type']} - {record['timestamp']}"):
+        st.markdown(f"**Topic:** {record['topic']}")
+        st.markdown(f"**Style:** {record['style']} | **Tone:** {record['tone']} | **Words:** {record['word_count']}")
+        st.markdown(f"**Content:**")
+        st.write(record.get("_preview", record["result"]))
+        
+        # Quick actions for history items
+        hist_col1, hist_col2 = st.columns(2)
+        with hist_col1:
+            if st.button(f"📋 Copy", key=f"hist_copy_{i}"):
+                st.success("Copied!")
+        with hist_col2:
+            st.download_button(
+                label="💾 Download",
+                data=record['result'],
+                file_name=f"content_{i}.md",
+                mime="text/markdown",
+                key=f"hist_download_{i}"
+            )
 
 def load_creative_writer_page():
     st.markdown("# ✍️ Creative Writer")
     st.markdown("*AI-powered creative writing assistant for compelling content creation*")
     
     # Initialize session state
-    if "creative_writer" not in st.session_state:
-        st.session_state.creative_writer = CreativeWriter()
+    writer = get_creative_writer()
     if "writing_history" not in st.session_state:
-        st.session_state.writing_history = []
+        # Bounded: long sessions keep at most the 100 most recent pieces
+        st.session_state.writing_history = deque(maxlen=100)
     
     # Sidebar controls
     with st.sidebar:
@@ -179,19 +564,19 @@ def load_creative_writer_page():
         # Content type selection
         content_type = st.selectbox(
             "📝 Content Type:",
-            st.session_state.creative_writer.content_types
+            writer.content_types
         )
         
         # Writing style
         writing_style = st.selectbox(
             "🎨 Writing Style:",
-            st.session_state.creative_writer.writing_styles
+            writer.writing_styles
         )
         
         # Tone
         tone = st.selectbox(
             "🎭 Tone:",
-            st.session_state.creative_writer.tones
+            writer.tones
         )
         
         # Word count
@@ -211,42 +596,24 @@ def load_creative_writer_page():
                 "Improve Content",
                 "Generate Ideas", 
                 "Create Outline",
-                "Analyze Content"
+                "Analyze Content",
+                "Generate + Analyze"
             ]
         )
         
+        # Ideas/outline/analysis run on the faster flash model by default
+        st.checkbox(
+            "💪 Always use Gemini Pro",
+            value=False,
+            key="force_pro",
+            help="Ideas, outlines and analysis use gemini-1.5-flash unless checked"
+        )
+        
         st.markdown("---")
         
         # Quick templates
         st.markdown("### ⚡ Content Templates")
-        templates = {
-            "Product Launch": {
-                "type": "Marketing Copy",
-                "topic": "New product launch announcement",
-                "style": "Persuasive",
-                "tone": "Enthusiastic"
-            },
-            "Company Blog": {
-                "type": "Blog Post", 
-                "topic": "Industry trends and insights",
-                "style": "Professional",
-                "tone": "Informative"
-            },
-            "Social Media": {
-                "type": "Social Media Post",
-                "topic": "Engaging social media content",
-                "style": "Casual",
-                "tone": "Friendly"
-            },
-            "Technical Guide": {
-                "type": "Technical Article",
-                "topic": "How-to guide for developers",
-                "style": "Technical",
-                "tone": "Authoritative"
-            }
-        }
-        
-        for template_name, template_data in templates.items():
+        for template_name, template_data in _TEMPLATES.items():
             if st.button(f"📋 {template_name}", use_container_width=True):
                 st.session_state.template_data = template_data
         
@@ -254,21 +621,23 @@ def load_creative_writer_page():
         
         # History management
         if st.button("🗑️ Clear History", use_container_width=True):
-            st.session_state.writing_history = []
+            st.session_state.writing_history.clear()
+            st.session_state.pop("history_keys", None)
             st.rerun()
         
         if st.session_state.writing_history:
-            if st.button("💾 Export History", use_container_width=True):
-                history_data = {
-                    "timestamp": datetime.now().isoformat(),
-                    "writings": st.session_state.writing_history
-                }
-                st.download_button(
-                    label="📥 Download JSON",
-                    data=json.dumps(history_data, indent=2),
-                    file_name=f"writing_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json"
-                )
+            # download_button evaluates its data argument on every rerun,
+            # so the serialized blob must be memoized to stay cheap
+            st.download_button(
+                label="💾 Export History",
+                data=_history_export(
+                    tuple(sorted(st.session_state.get("history_keys", set()))),
+                    list(st.session_state.writing_history)
+                ),
+                file_name=f"writing_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json",
+                use_container_width=True
+            )
     
     # Main content area
     col1, col2 = st.columns([1, 1])
@@ -295,7 +664,7 @@ def load_creative_writer_page():
         
         # Content for improvement/analysis
         existing_content = ""
-        if operation in ["Improve Content", "Analyze Content"]:
+        if operation in ["Improve Content", "Analyze Content", "Generate + Analyze"]:
             existing_content = st.text_area(
                 "📄 Existing Content:",
                 placeholder="Paste the content you want to improve or analyze...",
@@ -336,61 +705,103 @@ def load_creative_writer_page():
                 value=10
             )
         
+        # Speculative prefetch: once the inputs settle, warm the response
+        # cache in the background so the actual click is often a cache hit
+        if operation == "Generate Content" and topic.strip():
+            prefetch_key = (content_type, topic, writing_style, tone, word_count,
+                            additional_reqs if 'additional_reqs' in locals() else "")
+            if st.session_state.get("_prefetch_key") != prefetch_key:
+                prior = st.session_state.get("prefetch_future")
+                if prior is not None and not prior.done():
+                    prior.cancel()
+                st.session_state.prefetch_future = _prefetch_executor().submit(
+                    writer.generate_content,
+                    content_type, topic, writing_style, tone, word_count,
+                    additional_reqs if 'additional_reqs' in locals() else ""
+                )
+                st.session_state._prefetch_key = prefetch_key
+        
         # Process button
         if st.button("🚀 Create Content", type="primary", use_container_width=True):
             # Validate inputs
-            if operation in ["Generate Content", "Generate Ideas", "Create Outline"] and not topic:
+            if operation in ["Generate Content", "Generate Ideas", "Create Outline", "Generate + Analyze"] and not topic:
                 st.error("Please enter a topic.")
-            elif operation in ["Improve Content", "Analyze Content"] and not existing_content:
+            elif operation in ["Improve Content", "Analyze Content", "Generate + Analyze"] and not existing_content:
                 st.error("Please provide content to improve or analyze.")
             else:
                 # Track usage
                 if DB_AVAILABLE:
                     track_tool_usage("creative_writer", f"operation_{operation.lower().replace(' ', '_')}")
                 
-                with st.spinner(f"✨ {operation}..."):
-                    
-                    result = ""
-                    if operation == "Generate Content":
-                        result = st.session_state.creative_writer.generate_content(
-                            content_type, topic, writing_style, tone, word_count, 
-                            additional_reqs if 'additional_reqs' in locals() else ""
-                        )
-                    elif operation == "Improve Content":
-                        result = st.session_state.creative_writer.improve_content(
-                            existing_content, improvement_type
-                        )
-                    elif operation == "Generate Ideas":
-                        result = st.session_state.creative_writer.generate_ideas(
-                            topic, content_type, ideas_count
-                        )
-                    elif operation == "Create Outline":
-                        target_length = f"{word_count} words"
-                        result = st.session_state.creative_writer.create_outline(
-                            topic, content_type, target_length
-                        )
-                    elif operation == "Analyze Content":
-                        result = st.session_state.creative_writer.analyze_content(
+                result = ""
+                streamed = operation in ("Generate Content", "Improve Content")
+                if operation == "Generate Content":
+                    # Long-form output streams into the output column;
+                    # first tokens appear instead of a blocking spinner
+                    chunks = writer.generate_content(
+                        content_type, topic, writing_style, tone, word_count, 
+                        additional_reqs if 'additional_reqs' in locals() else "",
+                        stream=True
+                    )
+                    with col2:
+                        st.caption(f"✨ {operation}...")
+                        result = st.write_stream(chunks)
+                elif operation == "Improve Content":
+                    chunks = writer.improve_content(
+                        existing_content, improvement_type, stream=True
+                    )
+                    with col2:
+                        st.caption(f"✨ {operation}...")
+                        result = st.write_stream(chunks)
+                elif operation == "Generate + Analyze":
+                    # New content and the draft critique run concurrently
+                    with st.spinner("✨ Generating and analyzing in parallel..."):
+                        generated, analysis = writer.compose_and_analyze(
+                            content_type, topic, writing_style, tone, word_count,
                             existing_content
                         )
-                    
-                    # Store result
-                    st.session_state.current_writing_result = result
-                    
-                    # Save to history
-                    history_record = {
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "operation": operation,
-                        "content_type": content_type,
-                        "style": writing_style,
-                        "tone": tone,
-                        "topic": topic,
-                        "word_count": word_count,
-                        "result": result
-                    }
-                    st.session_state.writing_history.append(history_record)
-                    
-                    st.rerun()
+                    result = (
+                        f"## ✨ Generated Content\n\n{generated}\n\n"
+                        f"## 🔍 Analysis of Your Draft\n\n{analysis}"
+                    )
+                else:
+                    with st.spinner(f"✨ {operation}..."):
+                        if operation == "Generate Ideas":
+                            result = writer.generate_ideas(
+                                topic, content_type, ideas_count
+                            )
+                        elif operation == "Create Outline":
+                            target_length = f"{word_count} words"
+                            result = writer.create_outline(
+                                topic, content_type, target_length
+                            )
+                        elif operation == "Analyze Content":
+                            result = writer.analyze_content(
+                                existing_content
+                            )
+                
+                # Store result; one timestamp covers every downstream use
+                created = datetime.now()
+                st.session_state.current_writing_result = result
+                st.session_state.current_writing_time = created
+                
+                # Save to history
+                history_record = {
+                    "timestamp": created.strftime("%Y-%m-%d %H:%M:%S"),
+                    "operation": operation,
+                    "content_type": content_type,
+                    "style": writing_style,
+                    "tone": tone,
+                    "topic": topic,
+                    "word_count": word_count,
+                    "result": result
+                }
+                _push_history(history_record)
+                
+                # No st.rerun(): col2 renders after this block in source
+                # order, so the result shows this same run. Streamed output
+                # is already on screen; flag it so col2 skips the duplicate.
+                st.session_state._just_streamed = streamed
     
     with col2:
         st.markdown("### 📤 Output")
@@ -398,13 +809,14 @@ def load_creative_writer_page():
         if "current_writing_result" in st.session_state:
             result = st.session_state.current_writing_result
             
-            # Display result
-            st.markdown("**✨ Generated Content:**")
-            st.write(result)
+            # Display result (unless the streaming path just rendered it)
+            if not st.session_state.pop("_just_streamed", False):
+                st.markdown("**✨ Generated Content:**")
+                st.write(result)
             
-            # Word count analysis
-            word_count_actual = len(result.split())
-            st.caption(f"📊 Word count: {word_count_actual} words")
+            # Word count analysis (cached per unique result)
+            metrics = _content_metrics(result)
+            st.caption(f"📊 Word count: {metrics['words']} words")
             
             # Action buttons
             col_copy, col_save, col_improve = st.columns(3)
@@ -415,10 +827,11 @@ def load_creative_writer_page():
             
             with col_save:
                 file_extension = "md" if operation in ["Generate Content", "Improve Content"] else "txt"
+                created = st.session_state.get("current_writing_time") or datetime.now()
                 st.download_button(
                     label="💾 Save",
                     data=result,
-                    file_name=f"creative_writing_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}",
+                    file_name=f"creative_writing_{created.strftime('%Y%m%d_%H%M%S')}.{file_extension}",
                     mime="text/plain",
                     use_container_width=True
                 )
@@ -433,45 +846,21 @@ def load_creative_writer_page():
                 st.markdown("---")
                 st.markdown("**📈 Content Metrics:**")
                 
-                sentences = len([s for s in result.split('.') if s.strip()])
-                paragraphs = len([p for p in result.split('\n\n') if p.strip()])
-                
                 metric_col1, metric_col2, metric_col3 = st.columns(3)
                 with metric_col1:
-                    st.metric("Words", word_count_actual)
+                    st.metric("Words", metrics["words"])
                 with metric_col2:
-                    st.metric("Sentences", sentences)
+                    st.metric("Sentences", metrics["sentences"])
                 with metric_col3:
-                    st.metric("Paragraphs", paragraphs)
+                    st.metric("Paragraphs", metrics["paragraphs"])
         
         else:
             st.info("👈 Enter your requirements and click 'Create Content' to get started")
             
             # Example content ideas
             st.markdown("**💡 Content Ideas:**")
-            content_examples = {
-                "Blog Post": [
-                    "Industry trends and predictions",
-                    "How-to guides and tutorials",
-                    "Case studies and success stories",
-                    "Expert interviews and insights"
-                ],
-                "Marketing Copy": [
-                    "Product launch announcements",
-                    "Email marketing campaigns", 
-                    "Landing page copy",
-                    "Social media advertisements"
-                ],
-                "Technical Article": [
-                    "API documentation",
-                    "Software tutorials",
-                    "Best practices guides",
-                    "Technology comparisons"
-                ]
-            }
-            
-            if content_type in content_examples:
-                for example in content_examples[content_type]:
+            if content_type in _CONTENT_EXAMPLES:
+                for example in _CONTENT_EXAMPLES[content_type]:
                     st.markdown(f"• *{example}*")
     
     # Quick Actions
@@ -480,66 +869,111 @@ def load_creative_writer_page():
     
     quick_col1, quick_col2, quick_col3, quick_col4 = st.columns(4)
     
+    # Clicks queue up; "Run All Queued" fires every prompt in one
+    # concurrent dispatch instead of a round-trip per click
+    if "pending_batch" not in st.session_state:
+        st.session_state.pending_batch = []
+    
     with quick_col1:
         if st.button("📝 Blog Post Generator", use_container_width=True):
-            st.session_state.quick_action = {
+            st.session_state.pending_batch.append({
+                "label": "Blog Post",
                 "operation": "Generate Content",
                 "content_type": "Blog Post",
                 "style": "Professional",
                 "tone": "Informative"
-            }
+            })
     
     with quick_col2:
         if st.button("📱 Social Media Post", use_container_width=True):
-            st.session_state.quick_action = {
+            st.session_state.pending_batch.append({
+                "label": "Social Media Post",
                 "operation": "Generate Content", 
                 "content_type": "Social Media Post",
                 "style": "Casual",
                 "tone": "Engaging"
-            }
+            })
     
     with quick_col3:
         if st.button("✉️ Email Template", use_container_width=True):
-            st.session_state.quick_action = {
+            st.session_state.pending_batch.append({
+                "label": "Email Template",
                 "operation": "Generate Content",
                 "content_type": "Email",
                 "style": "Professional",
                 "tone": "Friendly"
-            }
+            })
     
     with quick_col4:
         if st.button("💡 Content Ideas", use_container_width=True):
-            st.session_state.quick_action = {
+            st.session_state.pending_batch.append({
+                "label": "Content Ideas",
                 "operation": "Generate Ideas",
                 "content_type": "Blog Post",
                 "count": 10
-            }
+            })
+    
+    pending = st.session_state.pending_batch
+    if pending:
+        st.caption("🧺 Queued: " + ", ".join(action["label"] for action in pending))
+        run_col, clear_col = st.columns(2)
+        with clear_col:
+            if st.button("🧹 Clear Queue", use_container_width=True):
+                st.session_state.pending_batch = []
+                st.rerun()
+        with run_col:
+            if st.button("🚀 Run All Queued", type="primary", use_container_width=True):
+                if not topic.strip():
+                    st.error("Please enter a topic first.")
+                else:
+                    prompts = []
+                    for action in pending:
+                        builder = _QUICK_PROMPTS[action["label"]]
+                        if action["operation"] == "Generate Ideas":
+                            prompts.append(builder(
+                                writer, topic=topic, count=action.get("count", 10)
+                            ))
+                        else:
+                            prompts.append(builder(
+                                writer, topic=topic, word_count=word_count
+                            ))
+                    
+                    if DB_AVAILABLE:
+                        track_tool_usage("creative_writer", "quick_action_batch")
+                    
+                    with st.spinner(f"✨ Running {len(prompts)} queued actions..."):
+                        results = writer.generate_batch(prompts)
+                    
+                    created = datetime.now()
+                    st.session_state.current_writing_time = created
+                    for action, result in zip(pending, results):
+                        _push_history({
+                            "timestamp": created.strftime("%Y-%m-%d %H:%M:%S"),
+                            "operation": action["operation"],
+                            "content_type": action["content_type"],
+                            "style": action.get("style", ""),
+                            "tone": action.get("tone", ""),
+                            "topic": topic,
+                            "word_count": word_count,
+                            "result": result
+                        })
+                    st.session_state.current_writing_result = results[-1]
+                    st.session_state.pending_batch = []
+                    st.rerun()
     
     # Writing History
     if st.session_state.writing_history:
         st.markdown("---")
         st.markdown("## 📚 Writing History")
         
-        for i, record in enumerate(reversed(st.session_state.writing_history[-5:])):  # Show last 5
-            with st.expander(f"✍️ {record['operation']} - {record['content_type']} - {record['timestamp']}"):
-                st.markdown(f"**Topic:** {record['topic']}")
-                st.markdown(f"**Style:** {record['style']} | **Tone:** {record['tone']} | **Words:** {record['word_count']}")
-                st.markdown(f"**Content:**")
-                st.write(record['result'][:500] + "..." if len(record['result']) > 500 else record['result'])
-                
-                # Quick actions for history items
-                hist_col1, hist_col2 = st.columns(2)
-                with hist_col1:
-                    if st.button(f"📋 Copy", key=f"hist_copy_{i}"):
-                        st.success("Copied!")
-                with hist_col2:
-                    st.download_button(
-                        label="💾 Download",
-                        data=record['result'],
-                        file_name=f"content_{i}.md",
-                        mime="text/markdown",
-                        key=f"hist_download_{i}"
-                    )
+        stats = _history_stats(tuple(r["result"] for r in st.session_state.writing_history))
+        st.caption(
+            f"📊 {stats['records']} pieces | {stats['total_words']} words total | "
+            f"~{stats['avg_words']} words each | {stats['total_sentences']} sentences"
+        )
+        
+        for i, record in enumerate(islice(reversed(st.session_state.writing_history), 5)):  # Show last 5
+            _render_history_row(record, i)
 
 # This would be called from the main app
 if __name__ == "__main__":
@@ -1,214 +1,559 @@
 import streamlit as st
 import google.generativeai as genai
+import asyncio
+import hashlib
 import os
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import atexit
 import json
 import io
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from string import Template
 from typing import List, Dict, Optional, Any
 
+# Optional fast serialization/compression for the history export; stdlib
+# json covers the gap when they are absent.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Import database utilities
 try:
-    from utils.database import track_tool_usage
+    from utils.database import get_database_manager, track_tool_usage
     DB_AVAILABLE = True
 except ImportError:
     DB_AVAILABLE = False
 
+from utils.llm_cache import LLMCache
+
+# Telemetry is fire-and-forget: the DB write happens off-thread so it never
+# sits in front of a Gemini call.
+_tracker_pool = ThreadPoolExecutor(max_workers=2)
+atexit.register(_tracker_pool.shutdown, wait=True)
+
+def _track_usage(action: str):
+    """Record a tool-usage event without blocking the click handler"""
+    if DB_AVAILABLE:
+        # Resolve the session id here, on the script thread: the worker
+        # has no script-run context, so reading st.session_state there
+        # would log the event under a phantom bare-mode session
+        session_id = get_database_manager().get_session_id()
+        _tracker_pool.submit(track_tool_usage, "data_analyst", action, session_id)
+
 # Configure Gemini
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
+# Prompt templates are built once at import time; only the dataset summary
+# is substituted per call.
+_ANALYSIS_PROMPTS = {
+    "Overview": Template("""
+    Analyze this dataset and provide a comprehensive overview:
+
+    $summary
+
+    Please provide:
+    1. Dataset description and structure analysis
+    2. Data quality assessment
+    3. Key patterns and trends observed
+    4. Potential insights and findings
+    5. Recommendations for further analysis
+    """),
+
+    "Statistical Analysis": Template("""
+    Perform statistical analysis on this dataset:
+
+    $summary
+
+    Please provide:
+    1. Descriptive statistics interpretation
+    2. Distribution analysis
+    3. Correlation insights
+    4. Outlier detection
+    5. Statistical significance tests suggestions
+    """),
+
+    "Business Insights": Template("""
+    Generate business insights from this dataset:
+
+    $summary
+
+    Please provide:
+    1. Key business metrics and KPIs
+    2. Performance indicators
+    3. Growth opportunities
+    4. Risk factors
+    5. Actionable recommendations
+    """),
+
+    "Trend Analysis": Template("""
+    Analyze trends in this dataset:
+
+    $summary
+
+    Please provide:
+    1. Time-based trends (if applicable)
+    2. Seasonal patterns
+    3. Growth/decline analysis
+    4. Forecasting insights
+    5. Trend implications
+    """),
+
+    "Data Quality": Template("""
+    Assess data quality for this dataset:
+
+    $summary
+
+    Please provide:
+    1. Completeness analysis
+    2. Accuracy assessment
+    3. Consistency evaluation
+    4. Data cleaning recommendations
+    5. Quality improvement suggestions
+    """)
+}
+
+# One batched request covers all five analysis angles; JSON mode keeps the
+# sections machine-separable without fragile text delimiters.
+_BATCH_PROMPT = Template("""
+    Analyze this dataset from five angles in a single pass.
+    Return a JSON object with exactly these string keys:
+    - "overview": dataset description, structure, key patterns and recommendations
+    - "statistical": descriptive statistics interpretation, distributions, correlations, outliers
+    - "business": key metrics and KPIs, opportunities, risks, actionable recommendations
+    - "trend": time-based and seasonal patterns, growth/decline, forecasting insights
+    - "quality": completeness, accuracy, consistency and cleaning recommendations
+
+    $summary
+    """)
+
+_BATCH_SECTIONS = {
+    "overview": "Overview",
+    "statistical": "Statistical Analysis",
+    "business": "Business Insights",
+    "trend": "Trend Analysis",
+    "quality": "Data Quality",
+}
+
+_VIZ_PROMPT = Template("""
+    Based on this dataset structure, suggest the most appropriate data visualizations:
+
+    $summary
+
+    For each suggestion, provide:
+    1. Chart type (bar, line, scatter, heatmap, etc.)
+    2. Variables to use (x-axis, y-axis, color, size)
+    3. Purpose and insights it would reveal
+    4. Target audience suitability
+
+    Prioritize visualizations that would be most insightful for this data.
+    """)
+
+_REPORT_PROMPTS = {
+    "Executive Summary": Template("""
+    Create an executive summary report for this dataset:
+
+    $summary
+
+    Include:
+    - Key findings summary
+    - Critical metrics
+    - Strategic recommendations
+    - Next steps
+    - Executive-level insights
+    """),
+
+    "Technical Report": Template("""
+    Create a technical data analysis report:
+
+    $summary
+
+    Include:
+    - Methodology explanation
+    - Statistical analysis details
+    - Data processing steps
+    - Technical findings
+    - Limitations and assumptions
+    """),
+
+    "Business Report": Template("""
+    Create a business-focused report:
+
+    $summary
+
+    Include:
+    - Business impact analysis
+    - Performance metrics
+    - Market insights
+    - ROI implications
+    - Strategic recommendations
+    """)
+}
+
+@st.cache_resource
+def _get_model() -> genai.GenerativeModel:
+    """Share one GenerativeModel across sessions.
+
+    The model object carries transport state (connection pool, auth), so
+    building it per session pays a fresh handshake on each user's first
+    call for no benefit — it holds no conversation state here.
+    """
+    return genai.GenerativeModel("gemini-1.5-pro")
+
 class DataAnalyst:
     def __init__(self):
-        self.model = genai.GenerativeModel("gemini-1.5-pro")
-    
-    def analyze_dataset(self, df: pd.DataFrame, analysis_type: str) -> str:
-        """Analyze dataset with AI insights"""
-        
-        # Prepare dataset summary
-        summary = self._get_dataset_summary(df)
-        
-        prompts = {
-            "Overview": f"""
-            Analyze this dataset and provide a comprehensive overview:
-            
-            {summary}
-            
-            Please provide:
-            1. Dataset description and structure analysis
-            2. Data quality assessment
-            3. Key patterns and trends observed
-            4. Potential insights and findings
-            5. Recommendations for further analysis
-            """,
-            
-            "Statistical Analysis": f"""
-            Perform statistical analysis on this dataset:
-            
-            {summary}
-            
-            Please provide:
-            1. Descriptive statistics interpretation
-            2. Distribution analysis
-            3. Correlation insights
-            4. Outlier detection
-            5. Statistical significance tests suggestions
-            """,
-            
-            "Business Insights": f"""
-            Generate business insights from this dataset:
-            
-            {summary}
-            
-            Please provide:
-            1. Key business metrics and KPIs
-            2. Performance indicators
-            3. Growth opportunities
-            4. Risk factors
-            5. Actionable recommendations
-            """,
-            
-            "Trend Analysis": f"""
-            Analyze trends in this dataset:
-            
-            {summary}
-            
-            Please provide:
-            1. Time-based trends (if applicable)
-            2. Seasonal patterns
-            3. Growth/decline analysis
-            4. Forecasting insights
-            5. Trend implications
-            """,
-            
-            "Data Quality": f"""
-            Assess data quality for this dataset:
-            
-            {summary}
-            
-            Please provide:
-            1. Completeness analysis
-            2. Accuracy assessment
-            3. Consistency evaluation
-            4. Data cleaning recommendations
-            5. Quality improvement suggestions
-            """
-        }
-        
-        prompt = prompts.get(analysis_type, prompts["Overview"])
-        
+        self.model = _get_model()
+        # Dataset summaries barely move between reruns of the same frame, so
+        # a tight similarity threshold still catches near-duplicates without
+        # serving stale analyses for genuinely different data.
+        self._cache = LLMCache(max_entries=128, similarity_threshold=0.98)
+
+    @staticmethod
+    def _cache_key(analysis_type: str, summary: str) -> str:
+        return hashlib.blake2b((analysis_type + summary).encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _analysis_prompt(summary: str, analysis_type: str) -> str:
+        template = _ANALYSIS_PROMPTS.get(analysis_type, _ANALYSIS_PROMPTS["Overview"])
+        return template.substitute(summary=summary)
+
+    @staticmethod
+    def _report_prompt(summary: str, report_type: str) -> str:
+        template = _REPORT_PROMPTS.get(report_type, _REPORT_PROMPTS["Executive Summary"])
+        return template.substitute(summary=summary)
+
+    def _cached_generate(self, analysis_type: str, summary: str, prompt: str,
+                         error_label: str) -> str:
+        """Serve from the response cache, falling back to a live call"""
+        key = self._cache_key(analysis_type, summary)
+        hit = self._cache.get(key, prompt)
+        if hit is not None:
+            return hit
+
         try:
             response = self.model.generate_content(prompt)
+            self._cache.set(key, prompt, response.text)
             return response.text
         except Exception as e:
-            return f"Error analyzing dataset: {str(e)}"
-    
-    def suggest_visualizations(self, df: pd.DataFrame) -> str:
-        """Suggest appropriate visualizations for the dataset"""
-        
-        summary = self._get_dataset_summary(df)
-        
-        prompt = f"""
-        Based on this dataset structure, suggest the most appropriate data visualizations:
-        
-        {summary}
-        
-        For each suggestion, provide:
-        1. Chart type (bar, line, scatter, heatmap, etc.)
-        2. Variables to use (x-axis, y-axis, color, size)
-        3. Purpose and insights it would reveal
-        4. Target audience suitability
-        
-        Prioritize visualizations that would be most insightful for this data.
+            return f"Error {error_label}: {str(e)}"
+
+    def _stream_generate(self, analysis_type: str, summary: str, prompt: str,
+                         error_label: str):
+        """Yield response chunks as they arrive, caching the joined text.
+
+        Cache hits are yielded whole, so callers can pass either path to
+        st.write_stream and the first tokens appear without waiting for
+        the full completion.
         """
-        
+        key = self._cache_key(analysis_type, summary)
+        hit = self._cache.get(key, prompt)
+        if hit is not None:
+            yield hit
+            return
+
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            parts = []
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield chunk.text
+            self._cache.set(key, prompt, "".join(parts))
         except Exception as e:
-            return f"Error suggesting visualizations: {str(e)}"
-    
-    def generate_report(self, df: pd.DataFrame, report_type: str) -> str:
+            yield f"Error {error_label}: {str(e)}"
+
+    def analyze_dataset(self, df: pd.DataFrame, analysis_type: str, stream: bool = False):
+        """Analyze dataset with AI insights"""
+
+        summary = self._get_dataset_summary(df)
+        prompt = self._analysis_prompt(summary, analysis_type)
+        if stream:
+            return self._stream_generate(analysis_type, summary, prompt, "analyzing dataset")
+        return self._cached_generate(analysis_type, summary, prompt, "analyzing dataset")
+
+    def suggest_visualizations(self, df: pd.DataFrame, stream: bool = False):
+        """Suggest appropriate visualizations for the dataset"""
+
+        summary = self._get_dataset_summary(df)
+        prompt = _VIZ_PROMPT.substitute(summary=summary)
+        if stream:
+            return self._stream_generate("Visualization Suggestions", summary, prompt,
+                                         "suggesting visualizations")
+        return self._cached_generate("Visualization Suggestions", summary, prompt,
+                                     "suggesting visualizations")
+
+    def generate_report(self, df: pd.DataFrame, report_type: str, stream: bool = False):
         """Generate comprehensive data report"""
-        
+
         summary = self._get_dataset_summary(df)
-        
-        report_prompts = {
-            "Executive Summary": f"""
-            Create an executive summary report for this dataset:
-            
-            {summary}
-            
-            Include:
-            - Key findings summary
-            - Critical metrics
-            - Strategic recommendations
-            - Next steps
-            - Executive-level insights
-            """,
-            
-            "Technical Report": f"""
-            Create a technical data analysis report:
-            
-            {summary}
-            
-            Include:
-            - Methodology explanation
-            - Statistical analysis details
-            - Data processing steps
-            - Technical findings
-            - Limitations and assumptions
-            """,
-            
-            "Business Report": f"""
-            Create a business-focused report:
-            
-            {summary}
-            
-            Include:
-            - Business impact analysis
-            - Performance metrics
-            - Market insights
-            - ROI implications
-            - Strategic recommendations
-            """
-        }
-        
-        prompt = report_prompts.get(report_type, report_prompts["Executive Summary"])
-        
+        prompt = self._report_prompt(summary, report_type)
+        if stream:
+            return self._stream_generate(report_type, summary, prompt, "generating report")
+        return self._cached_generate(report_type, summary, prompt, "generating report")
+
+    def analyze_all(self, df: pd.DataFrame) -> Dict[str, str]:
+        """Run all five analysis types in a single JSON-mode request.
+
+        One round-trip instead of five: the batched prompt asks for a JSON
+        object with one section per analysis type and the raw payload is
+        cached like any other response.
+        """
+        summary = self._get_dataset_summary(df)
+        prompt = _BATCH_PROMPT.substitute(summary=summary)
+        key = self._cache_key("Full Analysis", summary)
+
+        raw = self._cache.get(key, prompt)
+        if raw is None:
+            try:
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config={"response_mime_type": "application/json"}
+                )
+                raw = response.text
+                self._cache.set(key, prompt, raw)
+            except Exception as e:
+                return {"Overview": f"Error analyzing dataset: {str(e)}"}
+
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error generating report: {str(e)}"
+            parsed = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return {"Overview": raw}
+        return {label: str(parsed.get(field, "")) for field, label in _BATCH_SECTIONS.items()}
+
+    async def _agenerate(self, prompt: str) -> str:
+        """Async single-prompt call used by the concurrent flows"""
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+    async def analyze_all_async(self, df: pd.DataFrame, analysis_type: str,
+                                report_type: str) -> Dict[str, str]:
+        """Run analysis, visualization suggestions and report concurrently.
+
+        The three prompts are independent, so firing them through
+        generate_content_async + asyncio.gather overlaps the network
+        round-trips instead of serializing them. Cached responses are
+        served directly and only the misses hit the API.
+        """
+        summary = self._get_dataset_summary(df)
+        jobs = [
+            ("analysis", analysis_type, self._analysis_prompt(summary, analysis_type)),
+            ("visualizations", "Visualization Suggestions", _VIZ_PROMPT.substitute(summary=summary)),
+            ("report", report_type, self._report_prompt(summary, report_type)),
+        ]
+
+        results: Dict[str, str] = {}
+        pending = []
+        for slot, kind, prompt in jobs:
+            hit = self._cache.get(self._cache_key(kind, summary), prompt)
+            if hit is not None:
+                results[slot] = hit
+            else:
+                pending.append((slot, kind, prompt))
+
+        if pending:
+            fresh = await asyncio.gather(*[self._agenerate(p) for _, _, p in pending],
+                                         return_exceptions=True)
+            for (slot, kind, prompt), text in zip(pending, fresh):
+                if isinstance(text, Exception):
+                    results[slot] = f"Error generating response: {str(text)}"
+                else:
+                    self._cache.set(self._cache_key(kind, summary), prompt, text)
+                    results[slot] = text
+        return results
     
     def _get_dataset_summary(self, df: pd.DataFrame) -> str:
         """Generate comprehensive dataset summary"""
-        
-        summary = f"""
-        Dataset Summary:
-        - Shape: {df.shape[0]} rows, {df.shape[1]} columns
-        - Columns: {list(df.columns)}
-        - Data types: {dict(df.dtypes)}
-        - Missing values: {dict(df.isnull().sum())}
-        
-        Sample data (first 5 rows):
-        {df.head().to_string()}
-        
-        Descriptive statistics:
-        {df.describe().to_string() if len(df.select_dtypes(include='number').columns) > 0 else 'No numerical columns for statistics'}
-        
-        Unique values per column:
-        {dict(df.nunique())}
-        """
-        
-        return summary
+        return _dataset_summary(df)
+
+def _dataset_hash(df: pd.DataFrame) -> int:
+    """Content hash for cache keys.
 
-def create_visualization(df: pd.DataFrame, chart_type: str, x_col: str, y_col: str = None, color_col: str = None):
+    hash_pandas_object streams Cython per-column hashes, so this stays
+    cheap on multi-MB frames where a str()/pickle round-trip would be
+    O(N) Python-object work.
+    """
+    return hash((df.shape, tuple(df.columns),
+                 int(pd.util.hash_pandas_object(df, index=False).sum())))
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _dataset_hash})
+def _dataset_summary(df: pd.DataFrame) -> str:
+    """Build the prompt summary once per distinct frame.
+
+    Every analysis flow needs this string, so without memoization the
+    describe/nunique full-column scans run three times per click. The
+    hash_func keys on shape, columns and a Cython content hash rather
+    than pickling the whole frame.
+    """
+    # One fused scan instead of separate isnull().sum() and nunique()
+    # traversals of every column
+    agg = df.agg(['count', 'nunique'])
+    missing = (len(df) - agg.loc['count']).to_dict()
+    nunique = agg.loc['nunique'].to_dict()
+
+    # CSV is far denser than whitespace-padded to_string() output, and 15
+    # columns of sample/stats is plenty of signal; the CSV header already
+    # names the columns, so they are not listed separately.
+    sample = df.iloc[:5, :15].to_csv(index=False)
+    if len(df.select_dtypes(include='number').columns) > 0:
+        stats = df.describe().iloc[:, :15].round(3).to_csv()
+    else:
+        stats = 'No numerical columns for statistics'
+
+    summary = f"""
+    Dataset Summary:
+    - Shape: {df.shape[0]} rows, {df.shape[1]} columns
+    - Data types: {dict(df.dtypes)}
+    - Missing values: {missing}
+
+    Sample data (first 5 rows, CSV):
+    {sample}
+
+    Descriptive statistics (CSV):
+    {stats}
+
+    Unique values per column:
+    {nunique}
+    """
+
+    return summary
+
+@st.cache_resource
+def _upload_cache_dir() -> Path:
+    """Create the on-disk upload cache directory once per process"""
+    path = Path(tempfile.gettempdir()) / "gc_cache"
+    path.mkdir(exist_ok=True)
+    return path
+
+def _load_uploaded_file(name: str, raw: bytes) -> pd.DataFrame:
+    """Parse an upload, serving repeat loads from an on-disk parquet cache.
+
+    Streamlit reruns re-deliver the same bytes on every widget
+    interaction; hashing them once and persisting the parsed frame as
+    parquet turns every rerun after the first into a cheap columnar read
+    (this matters most for Excel, where the parse is pure Python).
+    """
+    digest = hashlib.sha256(raw).hexdigest()
+    cached = _upload_cache_dir() / f"{digest}.parquet"
+    if cached.exists():
+        try:
+            return pd.read_parquet(cached)
+        except Exception:
+            pass  # corrupt or unreadable cache entry; fall through to re-parse
+
+    buffer = io.BytesIO(raw)
+    if name.endswith('.csv'):
+        # Arrow's multithreaded tokenizer beats the default C engine on
+        # wide files; fall back when pyarrow is absent or the file uses
+        # options Arrow rejects.
+        try:
+            df = pd.read_csv(buffer, engine="pyarrow")
+        except (ImportError, ValueError):
+            buffer.seek(0)
+            df = pd.read_csv(buffer)
+    elif name.endswith('.xlsx'):
+        # calamine (Rust) parses xlsx an order of magnitude faster than
+        # openpyxl's pure-Python zip+xml walk.
+        try:
+            df = pd.read_excel(buffer, engine="calamine")
+        except (ImportError, ValueError):
+            buffer.seek(0)
+            df = pd.read_excel(buffer)
+    elif name.endswith('.json'):
+        df = pd.read_json(buffer)
+    else:
+        raise ValueError(f"Unsupported file type: {name}")
+
+    try:
+        df.to_parquet(cached)
+    except Exception:
+        pass  # no parquet engine or unsupported dtypes; caching is best-effort
+    return df
+
+@st.cache_data(show_spinner=False)
+def _sample_sales_data() -> pd.DataFrame:
+    """Build the demo sales dataset with vectorized arithmetic"""
+    i = np.arange(100)
+    sales = 100 + i * 2 + (i % 10) * 5
+    return pd.DataFrame({
+        'Date': pd.date_range('2023-01-01', periods=100, freq='D'),
+        'Sales': sales,
+        'Region': ['North', 'South', 'East', 'West'] * 25,
+        'Product': ['A', 'B', 'C'] * 33 + ['A'],
+        'Revenue': sales * 1.2,
+    })
+
+@st.cache_data(show_spinner=False)
+def _sample_customer_data() -> pd.DataFrame:
+    """Build the demo customer dataset with vectorized arithmetic"""
+    i = np.arange(150)
+    return pd.DataFrame({
+        'Customer_ID': i + 1,
+        'Age': 25 + i % 40,
+        'Gender': ['Male', 'Female'] * 75,
+        'City': ['NYC', 'LA', 'Chicago', 'Houston', 'Phoenix'] * 30,
+        'Purchase_Amount': 50 + i % 200,
+        'Satisfaction': 1 + i % 5,
+    })
+
+# Beyond this many rows the browser-side payload and render time dominate,
+# not the insight; point-based charts plot a sample instead.
+_MAX_PLOT_ROWS = 20_000
+
+def _export_history_payload(history_data: dict):
+    """Serialize the history export, compressed when zstd is available.
+
+    Returns (payload, extension, mime). Compact output — no indent —
+    roughly halves the size before compression even on the stdlib path.
+    """
+    if orjson is not None:
+        raw = orjson.dumps(history_data)
+    else:
+        raw = json.dumps(history_data, separators=(",", ":"), default=str).encode()
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(raw), "json.zst", "application/zstd"
+    return raw, "json", "application/json"
+
+def _set_dataset(df: pd.DataFrame):
+    """Store the active frame together with its content hash.
+
+    The hash lets reruns and derived caches tell "same data, new click"
+    apart from an actual dataset change without rescanning the frame.
+    """
+    st.session_state.current_dataset = df
+    st.session_state.current_dataset_hash = _dataset_hash(df)
+    # Dtype scans repeat in the overview, stats expander and heatmap;
+    # resolve the numeric columns once per dataset instead
+    st.session_state.numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    # Same for the visualization dropdowns, which otherwise rebuild their
+    # option lists on every selectbox-triggered rerun
+    columns = df.columns.tolist()
+    st.session_state.viz_x_opts = columns
+    st.session_state.viz_xy_opts = [None] + columns
+    st.session_state.viz_color_opts = [None] + df.select_dtypes(include=['object', 'category']).columns.tolist()
+
+def create_visualization(df: pd.DataFrame, chart_type: str, x_col: str, y_col: str = None, color_col: str = None,
+                         numeric_cols: Optional[List[str]] = None):
     """Create visualizations based on parameters"""
-    
+
     try:
+        if len(df) > _MAX_PLOT_ROWS:
+            # sort_index keeps temporal ordering intact for line charts
+            plot_df = df.sample(_MAX_PLOT_ROWS, random_state=0).sort_index()
+        else:
+            plot_df = df
+
         if chart_type == "Bar Chart":
             if y_col:
                 fig = px.bar(df, x=x_col, y=y_col, color=color_col, title=f"{y_col} by {x_col}")
@@ -217,22 +562,30 @@ def create_visualization(df: pd.DataFrame, chart_type: str, x_col: str, y_col: s
                 fig = px.bar(x=value_counts.index, y=value_counts.values, title=f"Distribution of {x_col}")
         
         elif chart_type == "Line Chart":
-            fig = px.line(df, x=x_col, y=y_col, color=color_col, title=f"{y_col} over {x_col}")
-        
+            fig = px.line(plot_df, x=x_col, y=y_col, color=color_col, title=f"{y_col} over {x_col}")
+
         elif chart_type == "Scatter Plot":
-            fig = px.scatter(df, x=x_col, y=y_col, color=color_col, title=f"{y_col} vs {x_col}")
-        
+            fig = px.scatter(plot_df, x=x_col, y=y_col, color=color_col, title=f"{y_col} vs {x_col}")
+
         elif chart_type == "Histogram":
-            fig = px.histogram(df, x=x_col, color=color_col, title=f"Distribution of {x_col}")
-        
+            fig = px.histogram(plot_df, x=x_col, color=color_col, title=f"Distribution of {x_col}")
+
         elif chart_type == "Box Plot":
-            fig = px.box(df, x=x_col, y=y_col, color=color_col, title=f"{y_col} distribution by {x_col}")
+            fig = px.box(plot_df, x=x_col, y=y_col, color=color_col, title=f"{y_col} distribution by {x_col}")
         
         elif chart_type == "Correlation Heatmap":
-            numeric_df = df.select_dtypes(include='number')
+            if numeric_cols is not None:
+                numeric_df = df[numeric_cols]
+            else:
+                numeric_df = df.select_dtypes(include='number')
             if len(numeric_df.columns) > 1:
-                corr_matrix = numeric_df.corr()
-                fig = px.imshow(corr_matrix, title="Correlation Heatmap", aspect="auto")
+                # One contiguous float32 matrix lets np.corrcoef hit BLAS
+                # instead of pandas' per-column dispatch, at half the
+                # memory bandwidth of float64.
+                arr = np.nan_to_num(numeric_df.to_numpy(dtype=np.float32, copy=False))
+                corr_matrix = np.corrcoef(arr, rowvar=False)
+                fig = px.imshow(corr_matrix, x=numeric_df.columns, y=numeric_df.columns,
+                                title="Correlation Heatmap", aspect="auto")
             else:
                 return None
         
@@ -253,7 +606,8 @@ def load_data_analyst_page():
     if "data_analyst" not in st.session_state:
         st.session_state.data_analyst = DataAnalyst()
     if "analysis_history" not in st.session_state:
-        st.session_state.analysis_history = []
+        # Bounded so a long session can't grow memory without limit
+        st.session_state.analysis_history = deque(maxlen=100)
     if "current_dataset" not in st.session_state:
         st.session_state.current_dataset = None
     
@@ -270,6 +624,7 @@ def load_data_analyst_page():
                 "Business Insights",
                 "Trend Analysis",
                 "Data Quality",
+                "Full Analysis (All Types)",
                 "Visualization Suggestions"
             ]
         )
@@ -285,48 +640,32 @@ def load_data_analyst_page():
         # Sample datasets
         st.markdown("### 📂 Sample Datasets")
         if st.button("📈 Sales Data", use_container_width=True):
-            # Generate sample sales data
-            sample_data = {
-                'Date': pd.date_range('2023-01-01', periods=100, freq='D'),
-                'Sales': [100 + i*2 + (i%10)*5 for i in range(100)],
-                'Region': ['North', 'South', 'East', 'West'] * 25,
-                'Product': ['A', 'B', 'C'] * 33 + ['A'],
-                'Revenue': [s * 1.2 for s in [100 + i*2 + (i%10)*5 for i in range(100)]]
-            }
-            st.session_state.current_dataset = pd.DataFrame(sample_data)
+            _set_dataset(_sample_sales_data())
             st.success("Sample sales data loaded!")
-        
+
         if st.button("👥 Customer Data", use_container_width=True):
-            # Generate sample customer data
-            sample_data = {
-                'Customer_ID': range(1, 151),
-                'Age': [25 + (i%40) for i in range(150)],
-                'Gender': ['Male', 'Female'] * 75,
-                'City': ['NYC', 'LA', 'Chicago', 'Houston', 'Phoenix'] * 30,
-                'Purchase_Amount': [50 + (i%200) for i in range(150)],
-                'Satisfaction': [1 + (i%5) for i in range(150)]
-            }
-            st.session_state.current_dataset = pd.DataFrame(sample_data)
+            _set_dataset(_sample_customer_data())
             st.success("Sample customer data loaded!")
         
         st.markdown("---")
         
         # History management
         if st.button("🗑️ Clear History", use_container_width=True):
-            st.session_state.analysis_history = []
+            st.session_state.analysis_history.clear()
             st.rerun()
         
         if st.session_state.analysis_history:
             if st.button("💾 Export History", use_container_width=True):
                 history_data = {
                     "timestamp": datetime.now().isoformat(),
-                    "analyses": st.session_state.analysis_history
+                    "analyses": list(st.session_state.analysis_history)
                 }
+                payload, ext, mime = _export_history_payload(history_data)
                 st.download_button(
                     label="📥 Download JSON",
-                    data=json.dumps(history_data, indent=2),
-                    file_name=f"analysis_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json"
+                    data=payload,
+                    file_name=f"analysis_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}",
+                    mime=mime
                 )
     
     # Main content area
@@ -344,17 +683,10 @@ def load_data_analyst_page():
         
         if uploaded_file:
             try:
-                # Load dataset based on file type
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                elif uploaded_file.name.endswith('.xlsx'):
-                    df = pd.read_excel(uploaded_file)
-                elif uploaded_file.name.endswith('.json'):
-                    df = pd.read_json(uploaded_file)
-                
-                st.session_state.current_dataset = df
+                df = _load_uploaded_file(uploaded_file.name, uploaded_file.getvalue())
+                _set_dataset(df)
                 st.success(f"Dataset loaded! Shape: {df.shape}")
-                
+
             except Exception as e:
                 st.error(f"Error loading file: {e}")
         
@@ -371,7 +703,7 @@ def load_data_analyst_page():
             st.dataframe(df.head(), use_container_width=True)
             
             # Basic statistics
-            if len(df.select_dtypes(include='number').columns) > 0:
+            if st.session_state.get("numeric_cols"):
                 with st.expander("📊 Basic Statistics"):
                     st.dataframe(df.describe(), use_container_width=True)
             
@@ -394,42 +726,77 @@ def load_data_analyst_page():
             # Analysis button
             if st.button("🚀 Analyze Dataset", type="primary", use_container_width=True):
                 # Track usage
-                if DB_AVAILABLE:
-                    track_tool_usage("data_analyst", f"analysis_{analysis_type.lower().replace(' ', '_')}")
-                
-                with st.spinner(f"🔍 Performing {analysis_type}..."):
-                    
+                _track_usage(f"analysis_{analysis_type.lower().replace(' ', '_')}")
+
+                if analysis_type == "Full Analysis (All Types)":
+                    # JSON-mode batch can't stream section by section
+                    with st.spinner(f"🔍 Performing {analysis_type}..."):
+                        sections = st.session_state.data_analyst.analyze_all(df)
+                        result = "\n\n".join(
+                            f"### {label}\n\n{text}" for label, text in sections.items() if text
+                        )
+                else:
+                    # Render chunks as they arrive instead of blocking on
+                    # the full completion
                     if analysis_type == "Visualization Suggestions":
-                        result = st.session_state.data_analyst.suggest_visualizations(df)
+                        chunks = st.session_state.data_analyst.suggest_visualizations(df, stream=True)
                     else:
-                        result = st.session_state.data_analyst.analyze_dataset(df, analysis_type)
-                    
-                    st.session_state.current_analysis = result
-                    
+                        chunks = st.session_state.data_analyst.analyze_dataset(df, analysis_type, stream=True)
+                    st.markdown("**🎯 Analysis Results:**")
+                    result = st.write_stream(chunks)
+                    st.session_state._analysis_streamed = True
+
+                st.session_state.current_analysis = result
+
+                # Save to history
+                history_record = {
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "analysis_type": analysis_type,
+                    "dataset_shape": df.shape,
+                    "columns": list(df.columns),
+                    "result": result
+                }
+                st.session_state.analysis_history.append(history_record)
+
+            # Generate report button
+            if st.button("📋 Generate Report", use_container_width=True):
+                st.markdown("**📋 Generated Report:**")
+                report = st.write_stream(
+                    st.session_state.data_analyst.generate_report(df, report_type, stream=True)
+                )
+                st.session_state.current_report = report
+                st.session_state._report_streamed = True
+
+            # Run everything concurrently
+            if st.button("⚡ Run All", use_container_width=True):
+                # Track usage
+                _track_usage("run_all")
+
+                with st.spinner(f"🔍 Running {analysis_type}, visualization suggestions and {report_type}..."):
+                    results = asyncio.run(
+                        st.session_state.data_analyst.analyze_all_async(df, analysis_type, report_type)
+                    )
+                    st.session_state.current_analysis = results["analysis"]
+                    st.session_state.current_report = results["report"]
+
                     # Save to history
                     history_record = {
                         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                         "analysis_type": analysis_type,
                         "dataset_shape": df.shape,
                         "columns": list(df.columns),
-                        "result": result
+                        "result": results["analysis"] + "\n\n---\n\n" + results["visualizations"]
                     }
                     st.session_state.analysis_history.append(history_record)
-                    
-                    st.rerun()
-            
-            # Generate report button
-            if st.button("📋 Generate Report", use_container_width=True):
-                with st.spinner(f"📝 Generating {report_type}..."):
-                    report = st.session_state.data_analyst.generate_report(df, report_type)
-                    st.session_state.current_report = report
+
                     st.rerun()
             
             # Display analysis results
             if "current_analysis" in st.session_state:
-                st.markdown("**🎯 Analysis Results:**")
-                st.write(st.session_state.current_analysis)
-                
+                if not st.session_state.pop("_analysis_streamed", False):
+                    st.markdown("**🎯 Analysis Results:**")
+                    st.write(st.session_state.current_analysis)
+
                 # Action buttons
                 col_copy, col_save = st.columns(2)
                 with col_copy:
@@ -447,9 +814,10 @@ def load_data_analyst_page():
             # Display report
             if "current_report" in st.session_state:
                 st.markdown("---")
-                st.markdown("**📋 Generated Report:**")
-                st.write(st.session_state.current_report)
-                
+                if not st.session_state.pop("_report_streamed", False):
+                    st.markdown("**📋 Generated Report:**")
+                    st.write(st.session_state.current_report)
+
                 st.download_button(
                     label="💾 Save Report",
                     data=st.session_state.current_report,
@@ -491,52 +859,59 @@ def load_data_analyst_page():
         with viz_col2:
             x_column = st.selectbox(
                 "📊 X-axis:",
-                df.columns,
+                st.session_state.viz_x_opts,
                 index=0
             )
-        
+
         with viz_col3:
-            y_columns = [None] + list(df.columns)
+            y_columns = st.session_state.viz_xy_opts
             y_column = st.selectbox(
                 "📈 Y-axis:",
                 y_columns,
                 index=1 if len(y_columns) > 1 else 0
             )
-        
+
         # Color column (optional)
-        color_columns = [None] + list(df.select_dtypes(include=['object', 'category']).columns)
         color_column = st.selectbox(
             "🎨 Color by (optional):",
-            color_columns
+            st.session_state.viz_color_opts
         )
         
         # Create visualization
         if st.button("📊 Create Visualization", use_container_width=True):
             # Track usage
-            if DB_AVAILABLE:
-                track_tool_usage("data_analyst", f"visualization_{chart_type.lower().replace(' ', '_')}")
-            
-            fig = create_visualization(df, chart_type, x_column, y_column, color_column)
+            _track_usage(f"visualization_{chart_type.lower().replace(' ', '_')}")
+
+            fig = create_visualization(df, chart_type, x_column, y_column, color_column,
+                                       numeric_cols=st.session_state.get("numeric_cols"))
             if fig:
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Save chart
-                chart_html = fig.to_html()
-                st.download_button(
-                    label="💾 Save Chart",
-                    data=chart_html,
-                    file_name=f"chart_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
-                    mime="text/html"
-                )
+                # Serialize once and stash; reruns replot from the cached
+                # JSON and the download reuses the cached HTML instead of
+                # re-serializing the figure every time.
+                st.session_state.last_fig_json = fig.to_json()
+                st.session_state.last_fig_html = fig.to_html(include_plotlyjs="cdn")
             else:
+                st.session_state.pop("last_fig_json", None)
+                st.session_state.pop("last_fig_html", None)
                 st.error("Could not create visualization with the selected parameters.")
+
+        if "last_fig_json" in st.session_state:
+            st.plotly_chart(json.loads(st.session_state.last_fig_json), use_container_width=True)
+
+            st.download_button(
+                label="💾 Save Chart",
+                data=st.session_state.last_fig_html,
+                file_name=f"chart_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
+                mime="text/html"
+            )
     
     # Analysis History
     if st.session_state.analysis_history:
         st.markdown("---")
         st.markdown("## 📚 Analysis History")
         
-        for i, record in enumerate(reversed(st.session_state.analysis_history[-5:])):  # Show last 5
+        # islice over reversed() walks only the 5 shown records, no slice copy
+        for i, record in enumerate(islice(reversed(st.session_state.analysis_history), 5)):
             with st.expander(f"📊 {record['analysis_type']} - {record['timestamp']}"):
                 # Safe access to dataset_shape
                 if 'dataset_shape' in record:
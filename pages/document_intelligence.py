@@ -1,9 +1,11 @@
 import streamlit as st
 import google.generativeai as genai
+import asyncio
 import os
 import json
 import io
 from datetime import datetime
+from string import Template
 from typing import List, Dict, Optional
 import base64
 
@@ -14,209 +16,458 @@ try:
 except ImportError:
     DB_AVAILABLE = False
 
+from utils.llm_cache import LLMCache
+from utils.chunker import split_text
+
 # Configure Gemini
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
+# Folded into every cache key; bump when the prompt wording changes so stale
+# responses for the old templates stop matching.
+_PROMPT_VERSION = 1
+
+# Documents beyond roughly 8k tokens of content go through map-reduce
+# instead of a single oversized request
+_CHUNK_THRESHOLD = 32_000
+
+# Prompt templates are built once at import time; only the document (and
+# question/language where relevant) is substituted per call.
+_ANALYSIS_PROMPTS = {
+    "Summary": Template("""
+    Provide a comprehensive summary of this document:
+
+    $content
+
+    Include:
+    - Main topics and themes
+    - Key points and arguments
+    - Important details and facts
+    - Overall structure and organization
+    - Target audience and purpose
+    """),
+
+    "Key Points": Template("""
+    Extract and list the key points from this document:
+
+    $content
+
+    Format as:
+    - Bullet points for easy reading
+    - Prioritize by importance
+    - Include supporting details where relevant
+    - Group related points together
+    """),
+
+    "Q&A Generation": Template("""
+    Generate comprehensive Q&A pairs based on this document:
+
+    $content
+
+    Create:
+    - 10-15 relevant questions and answers
+    - Mix of factual, analytical, and conceptual questions
+    - Questions that test understanding of key concepts
+    - Answers that are complete and accurate
+    """),
+
+    "Critical Analysis": Template("""
+    Provide a critical analysis of this document:
+
+    $content
+
+    Analyze:
+    - Strengths and weaknesses of arguments
+    - Evidence quality and credibility
+    - Logical consistency and flow
+    - Potential biases or gaps
+    - Overall effectiveness and impact
+    """),
+
+    "Citation Format": Template("""
+    Generate proper citations for this document content:
+
+    $content
+
+    Provide citations in multiple formats:
+    - APA style
+    - MLA style
+    - Chicago style
+    - IEEE style (if applicable)
+    - Include guidance on reference formatting
+    """)
+}
+
+_QA_PROMPT = Template("""
+    Based on this document content, answer the following question accurately and comprehensively:
+
+    Document:
+    $content
+
+    Question: $question
+
+    Instructions:
+    - Provide a direct and complete answer
+    - Use specific information from the document
+    - Quote relevant passages when helpful
+    - If the answer isn't in the document, clearly state that
+    - Explain your reasoning
+    """)
+
+_ENTITY_PROMPT = Template("""
+    Extract and categorize key entities from this document:
+
+    $content
+
+    Categories to extract:
+    - People (names, roles, titles)
+    - Organizations (companies, institutions)
+    - Locations (cities, countries, addresses)
+    - Dates and times
+    - Numbers and statistics
+    - Technical terms and concepts
+    - Products and services
+    - Events and processes
+
+    Format the results clearly with categories and bullet points.
+    """)
+
+_COMPARE_PROMPT = Template("""
+    Compare and contrast these two documents:
+
+    Document 1:
+    $doc1
+
+    Document 2:
+    $doc2
+
+    Provide analysis on:
+    - Similarities in content and themes
+    - Key differences and contrasts
+    - Complementary information
+    - Conflicting viewpoints
+    - Relative strengths and weaknesses
+    - Synthesis and integration opportunities
+    """)
+
+_TRANSLATE_PROMPT = Template("""
+    Translate this document to $target_language, maintaining the original structure, tone, and meaning:
+
+    $content
+
+    Requirements:
+    - Preserve formatting and structure
+    - Maintain professional tone
+    - Ensure cultural appropriateness
+    - Keep technical terms accurate
+    - Provide natural, fluent translation
+    """)
+
+_BUNDLE_PROMPT = Template("""
+    Analyze this document and return a JSON object with exactly these string keys:
+    - "summary": a comprehensive summary covering topics, key points and purpose
+    - "key_points": the main points as a bulleted list, prioritized by importance
+    - "entities": key entities grouped by category (people, organizations, locations, dates, statistics)
+    - "qa_pairs": 10-15 relevant question and answer pairs covering the key concepts
+
+    Document:
+    $content
+    """)
+
+@st.cache_resource
+def _get_model() -> genai.GenerativeModel:
+    """Share one GenerativeModel (and its transport state) across sessions"""
+    return genai.GenerativeModel("gemini-1.5-pro")
+
 class DocumentIntelligence:
     def __init__(self):
-        self.model = genai.GenerativeModel("gemini-1.5-pro")
+        self.model = _get_model()
         self.supported_formats = [".txt", ".pdf", ".docx", ".md"]
-    
-    def analyze_document(self, content: str, analysis_type: str) -> str:
-        """Analyze document content"""
-        
-        prompts = {
-            "Summary": f"""
-            Provide a comprehensive summary of this document:
-            
-            {content}
-            
-            Include:
-            - Main topics and themes
-            - Key points and arguments
-            - Important details and facts
-            - Overall structure and organization
-            - Target audience and purpose
-            """,
-            
-            "Key Points": f"""
-            Extract and list the key points from this document:
-            
-            {content}
-            
-            Format as:
-            - Bullet points for easy reading
-            - Prioritize by importance
-            - Include supporting details where relevant
-            - Group related points together
-            """,
-            
-            "Q&A Generation": f"""
-            Generate comprehensive Q&A pairs based on this document:
-            
-            {content}
-            
-            Create:
-            - 10-15 relevant questions and answers
-            - Mix of factual, analytical, and conceptual questions
-            - Questions that test understanding of key concepts
-            - Answers that are complete and accurate
-            """,
-            
-            "Critical Analysis": f"""
-            Provide a critical analysis of this document:
-            
-            {content}
-            
-            Analyze:
-            - Strengths and weaknesses of arguments
-            - Evidence quality and credibility
-            - Logical consistency and flow
-            - Potential biases or gaps
-            - Overall effectiveness and impact
-            """,
-            
-            "Citation Format": f"""
-            Generate proper citations for this document content:
-            
-            {content}
-            
-            Provide citations in multiple formats:
-            - APA style
-            - MLA style  
-            - Chicago style
-            - IEEE style (if applicable)
-            - Include guidance on reference formatting
-            """
-        }
-        
-        prompt = prompts.get(analysis_type, prompts["Summary"])
-        
+        # Exact-key matches only: prompts here are mostly document
+        # tokens, so the embedding tier would cross-match different
+        # analysis types over the same document
+        self._cache = LLMCache(max_entries=256, similarity_threshold=None)
+
+    def _cached_generate(self, prompt: str, error_label: str,
+                         generation_config: Optional[dict] = None) -> str:
+        """Serve from the response cache, falling back to a live call.
+
+        The dominant cost on this page is the Gemini round-trip, so a
+        repeat of the same document+analysis pair should be a dict
+        lookup, not a multi-second network call.
+        """
+        key = LLMCache.cache_key(f"v{_PROMPT_VERSION}:{prompt}")
+        hit = self._cache.get(key, prompt)
+        if hit is not None:
+            return hit
+
         try:
-            response = self.model.generate_content(prompt)
+            response = self.model.generate_content(prompt, generation_config=generation_config)
+            self._cache.set(key, prompt, response.text)
             return response.text
         except Exception as e:
-            return f"Error analyzing document: {str(e)}"
+            return f"Error {error_label}: {str(e)}"
     
-    def answer_question(self, content: str, question: str) -> str:
-        """Answer specific questions about the document"""
-        
-        prompt = f"""
-        Based on this document content, answer the following question accurately and comprehensively:
-        
-        Document:
-        {content}
-        
-        Question: {question}
-        
-        Instructions:
-        - Provide a direct and complete answer
-        - Use specific information from the document
-        - Quote relevant passages when helpful
-        - If the answer isn't in the document, clearly state that
-        - Explain your reasoning
+    @staticmethod
+    def _analysis_prompt(content: str, analysis_type: str) -> str:
+        template = _ANALYSIS_PROMPTS.get(analysis_type, _ANALYSIS_PROMPTS["Summary"])
+        return template.substitute(content=content)
+
+    def analyze_document(self, content: str, analysis_type: str, stream: bool = False):
+        """Analyze document content"""
+
+        if len(content) > _CHUNK_THRESHOLD:
+            return self._map_reduce(content, analysis_type, stream)
+
+        prompt = self._analysis_prompt(content, analysis_type)
+
+        if stream:
+            return self._stream_generate(prompt, "analyzing document")
+        return self._cached_generate(prompt, "analyzing document")
+
+    def _map_reduce(self, content: str, analysis_type: str, stream: bool = False):
+        """Chunked analysis for documents too large for one request.
+
+        Consecutive ~8k-token chunks are analyzed concurrently (the map,
+        through analyze_many, so each chunk result is individually
+        cached), then a short reduce call merges the partial results.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error answering question: {str(e)}"
+        chunks = split_text(content)
+        partials = asyncio.run(self.analyze_many(
+            [self._analysis_prompt(chunk, analysis_type) for chunk in chunks]
+        ))
+
+        combined = "\n\n".join(f"Part {i + 1}:\n{part}" for i, part in enumerate(partials))
+        reduce_prompt = f"""
+        The following are "{analysis_type}" results for consecutive parts of one document.
+        Merge them into a single coherent result of the same kind, removing repetition
+        and overlap between parts:
+
+        {combined}
+        """
+
+        if stream:
+            return self._stream_generate(reduce_prompt, "analyzing document")
+        return self._cached_generate(reduce_prompt, "analyzing document")
     
-    def extract_entities(self, content: str) -> str:
+    def answer_question(self, content: str, question: str, stream: bool = False):
+        """Answer specific questions about the document"""
+
+        prompt = _QA_PROMPT.substitute(content=content, question=question)
+
+        if stream:
+            return self._stream_generate(prompt, "answering question")
+        return self._cached_generate(prompt, "answering question")
+
+    def extract_entities(self, content: str, stream: bool = False):
         """Extract key entities from document"""
-        
-        prompt = f"""
-        Extract and categorize key entities from this document:
-        
-        {content}
-        
-        Categories to extract:
-        - People (names, roles, titles)
-        - Organizations (companies, institutions)
-        - Locations (cities, countries, addresses)
-        - Dates and times
-        - Numbers and statistics
-        - Technical terms and concepts
-        - Products and services
-        - Events and processes
-        
-        Format the results clearly with categories and bullet points.
+
+        prompt = _ENTITY_PROMPT.substitute(content=content)
+
+        if stream:
+            return self._stream_generate(prompt, "extracting entities")
+        return self._cached_generate(prompt, "extracting entities")
+
+    def compare_documents(self, doc1: str, doc2: str, stream: bool = False):
+        """Compare two documents.
+
+        Both documents are summarized first — two concurrent calls, each
+        riding the response cache — and the comparison runs over the
+        summaries. That roughly halves input tokens, keeps the combined
+        prompt clear of the payload limit, and makes repeat comparisons
+        against an already-summarized reference document a single short
+        round-trip.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error extracting entities: {str(e)}"
-    
-    def compare_documents(self, doc1: str, doc2: str) -> str:
-        """Compare two documents"""
-        
-        prompt = f"""
-        Compare and contrast these two documents:
-        
-        Document 1:
-        {doc1}
-        
-        Document 2:
-        {doc2}
-        
-        Provide analysis on:
-        - Similarities in content and themes
-        - Key differences and contrasts
-        - Complementary information
-        - Conflicting viewpoints
-        - Relative strengths and weaknesses
-        - Synthesis and integration opportunities
+        summaries = asyncio.run(self.analyze_many([
+            self._analysis_prompt(doc1, "Summary"),
+            self._analysis_prompt(doc2, "Summary"),
+        ]))
+        prompt = _COMPARE_PROMPT.substitute(doc1=summaries[0], doc2=summaries[1])
+
+        if stream:
+            return self._stream_generate(prompt, "comparing documents")
+        return self._cached_generate(prompt, "comparing documents")
+
+    def translate_document(self, content: str, target_language: str, stream: bool = False):
+        """Translate document to target language"""
+
+        prompt = _TRANSLATE_PROMPT.substitute(content=content, target_language=target_language)
+
+        if stream:
+            return self._stream_generate(prompt, "translating document")
+        return self._cached_generate(prompt, "translating document")
+
+    def _stream_generate(self, prompt: str, error_label: str):
+        """Yield response chunks as they arrive, caching the joined text.
+
+        Cache hits are yielded whole, so both paths feed st.write_stream
+        and the first tokens show up at time-to-first-token instead of
+        after the full completion.
         """
-        
+        key = LLMCache.cache_key(f"v{_PROMPT_VERSION}:{prompt}")
+        hit = self._cache.get(key, prompt)
+        if hit is not None:
+            yield hit
+            return
+
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            parts = []
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield chunk.text
+            self._cache.set(key, prompt, "".join(parts))
         except Exception as e:
-            return f"Error comparing documents: {str(e)}"
-    
-    def translate_document(self, content: str, target_language: str) -> str:
-        """Translate document to target language"""
-        
-        prompt = f"""
-        Translate this document to {target_language}, maintaining the original structure, tone, and meaning:
-        
-        {content}
-        
-        Requirements:
-        - Preserve formatting and structure
-        - Maintain professional tone
-        - Ensure cultural appropriateness
-        - Keep technical terms accurate
-        - Provide natural, fluent translation
+            yield f"Error {error_label}: {str(e)}"
+
+    async def _agenerate(self, prompt: str, semaphore: asyncio.Semaphore) -> str:
+        """Async single-prompt call, throttled by the shared semaphore"""
+        async with semaphore:
+            response = await self.model.generate_content_async(prompt)
+            return response.text
+
+    async def analyze_many(self, prompts: List[str]) -> List[str]:
+        """Answer independent prompts concurrently, in input order.
+
+        Wall-clock becomes max(call latencies) instead of the sum; at
+        most eight calls are in flight at once for rate-limit safety.
+        Cached prompts are served without touching the API and failures
+        come back as the usual error strings rather than aborting the
+        batch.
         """
-        
+        semaphore = asyncio.Semaphore(8)
+        results: List[Optional[str]] = [None] * len(prompts)
+        pending = []
+        for i, prompt in enumerate(prompts):
+            key = LLMCache.cache_key(f"v{_PROMPT_VERSION}:{prompt}")
+            hit = self._cache.get(key, prompt)
+            if hit is not None:
+                results[i] = hit
+            else:
+                pending.append((i, key, prompt))
+
+        if pending:
+            fresh = await asyncio.gather(
+                *[self._agenerate(prompt, semaphore) for _, _, prompt in pending],
+                return_exceptions=True
+            )
+            for (i, key, prompt), text in zip(pending, fresh):
+                if isinstance(text, Exception):
+                    results[i] = f"Error generating response: {str(text)}"
+                else:
+                    self._cache.set(key, prompt, text)
+                    results[i] = text
+        return results
+
+    def analyze_bundle(self, content: str) -> Dict[str, str]:
+        """Run the four Quick Actions as a single JSON-mode request.
+
+        The document tokens are paid once instead of four times and one
+        round-trip replaces up to four. The raw payload rides the
+        response cache, so every quick button after the first click on
+        the same document is free.
+        """
+        prompt = _BUNDLE_PROMPT.substitute(content=content)
+
+        raw = self._cached_generate(prompt, "analyzing document",
+                                    generation_config={"response_mime_type": "application/json"})
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error translating document: {str(e)}"
+            parsed = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return {"summary": raw, "key_points": "", "entities": "", "qa_pairs": ""}
+        return {field: str(parsed.get(field, ""))
+                for field in ("summary", "key_points", "entities", "qa_pairs")}
+
+@st.cache_resource
+def _get_doc_intelligence() -> DocumentIntelligence:
+    """Process-wide DocumentIntelligence singleton.
+
+    The instance holds no per-user state, and sharing it also shares the
+    response cache, so one user's analysis of a common document benefits
+    the next.
+    """
+    return DocumentIntelligence()
+
+def _iter_pdf_pages(raw: bytes):
+    """Yield (page_index, page_count, text) per PDF page.
+
+    Generator form keeps the working set at one page of text at a time
+    instead of materializing the whole document up front, and the
+    (index, count) pair lets the caller drive a progress bar while a
+    long document extracts.
+    """
+    try:
+        # PDFium's C extractor is an order of magnitude faster than
+        # PyPDF2's pure-Python parse on long documents
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(raw)
+        try:
+            total = len(pdf)
+            for i, page in enumerate(pdf):
+                textpage = page.get_textpage()
+                try:
+                    yield i, total, textpage.get_text_range()
+                finally:
+                    # Release the C-side memory as we go
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+    else:
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(raw))
+        total = len(pdf_reader.pages)
+        for i, page in enumerate(pdf_reader.pages):
+            yield i, total, page.extract_text()
+
+# Prefixes process_uploaded_file uses for failure messages
+_ERROR_PREFIXES = ("Error", "PDF processing", "DOCX processing")
+
+def _set_document(content: str, name: str):
+    """Store the active document and precompute its validity flag.
+
+    The error-prefix scan happens once here instead of being repeated
+    against a potentially huge string on every rerun.
+    """
+    st.session_state.document_content = content
+    st.session_state.current_document = name
+    st.session_state.document_ok = bool(content.strip()) and not content.startswith(_ERROR_PREFIXES)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _doc_stats(content: str):
+    """Word count, character count and preview, computed once per document.
+
+    .split() on a multi-MB paste allocates millions of substrings, and
+    without memoization it reran on every widget interaction.
+    """
+    return len(content.split()), len(content), content[:500]
 
 def process_uploaded_file(uploaded_file) -> str:
     """Process uploaded file and extract text content"""
-    
+
     try:
         if uploaded_file.type == "text/plain":
-            return str(uploaded_file.read(), "utf-8")
-        
+            # Stream-decode off the upload instead of materializing the
+            # raw bytes first — one copy instead of two for large files
+            return io.TextIOWrapper(uploaded_file, encoding="utf-8", errors="replace").read()
+
         elif uploaded_file.type == "application/pdf":
             try:
-                import PyPDF2
-                pdf_reader = PyPDF2.PdfReader(uploaded_file)
-                text_content = ""
-                for page in pdf_reader.pages:
-                    text_content += page.extract_text() + "\n"
-                
+                raw = uploaded_file.read()
+                pages = []
+                bar = st.progress(0.0, text="Extracting PDF text...")
+                for i, total, text in _iter_pdf_pages(raw):
+                    pages.append(text)
+                    bar.progress((i + 1) / total, text=f"Extracting PDF text... page {i + 1}/{total}")
+                bar.empty()
+                text_content = "\n".join(pages) + "\n"
+
                 if len(text_content.strip()) < 10:
                     return "PDF appears to be empty or contains only images. Please use a text-based PDF."
-                
+
                 return text_content
             except ImportError:
                 return "PDF processing requires PyPDF2. Please install: pip install PyPDF2"
@@ -241,11 +492,9 @@ def process_uploaded_file(uploaded_file) -> str:
                 return f"Error processing DOCX: {str(e)}"
         
         else:
-            # Try to read as text
-            content = uploaded_file.read()
-            if isinstance(content, bytes):
-                return content.decode('utf-8')
-            return str(content)
+            # Try to read as text, decoding incrementally instead of
+            # materializing the raw bytes first
+            return io.TextIOWrapper(uploaded_file, encoding="utf-8", errors="replace").read()
     
     except Exception as e:
         return f"Error processing file: {str(e)}"
@@ -256,13 +505,15 @@ def load_document_intelligence_page():
     
     # Initialize session state
     if "doc_intelligence" not in st.session_state:
-        st.session_state.doc_intelligence = DocumentIntelligence()
+        st.session_state.doc_intelligence = _get_doc_intelligence()
     if "document_history" not in st.session_state:
         st.session_state.document_history = []
     if "current_document" not in st.session_state:
         st.session_state.current_document = None
     if "document_content" not in st.session_state:
         st.session_state.document_content = ""
+    if "document_ok" not in st.session_state:
+        st.session_state.document_ok = False
     
     # Sidebar controls
     with st.sidebar:
@@ -347,8 +598,7 @@ def load_document_intelligence_page():
         
         for doc_name, doc_content in sample_docs.items():
             if st.button(f"📄 {doc_name}", use_container_width=True):
-                st.session_state.document_content = doc_content
-                st.session_state.current_document = doc_name
+                _set_document(doc_content, doc_name)
                 st.success(f"Loaded {doc_name}")
         
         st.markdown("---")
@@ -392,12 +642,11 @@ def load_document_intelligence_page():
             
             if uploaded_file:
                 content = process_uploaded_file(uploaded_file)
-                st.session_state.document_content = content
-                st.session_state.current_document = uploaded_file.name
-                
-                if len(content.strip()) > 20 and not content.startswith("Error") and not content.startswith("PDF processing") and not content.startswith("DOCX processing"):  # More reasonable minimum length
+                _set_document(content, uploaded_file.name)
+
+                if st.session_state.document_ok and len(content.strip()) > 20:  # More reasonable minimum length
                     st.success(f"Document loaded: {len(content)} characters")
-                elif content.startswith("Error") or content.startswith("PDF processing") or content.startswith("DOCX processing"):
+                elif not st.session_state.document_ok and content:
                     st.error(content)
                 else:
                     st.warning("Document seems too short or failed to load properly")
@@ -412,8 +661,7 @@ def load_document_intelligence_page():
             )
             
             if content:
-                st.session_state.document_content = content
-                st.session_state.current_document = "Text Input"
+                _set_document(content, "Text Input")
         
         elif input_method == "URL Input":
             url = st.text_input("Enter document URL:")
@@ -421,20 +669,17 @@ def load_document_intelligence_page():
                 st.warning("URL loading not implemented. Please use file upload or text input.")
         
         # Document preview
-        if st.session_state.document_content and not st.session_state.document_content.startswith("Error") and not st.session_state.document_content.startswith("PDF processing") and not st.session_state.document_content.startswith("DOCX processing"):
+        if st.session_state.document_ok:
             st.markdown("### 👀 Document Preview")
-            preview_length = min(500, len(st.session_state.document_content))
+            word_count, char_count, preview = _doc_stats(st.session_state.document_content)
             st.text_area(
-                f"First {preview_length} characters:",
-                value=st.session_state.document_content[:preview_length],
+                f"First {len(preview)} characters:",
+                value=preview,
                 height=150,
                 disabled=True
             )
-            
+
             # Document stats
-            word_count = len(st.session_state.document_content.split())
-            char_count = len(st.session_state.document_content)
-            
             stat_col1, stat_col2 = st.columns(2)
             with stat_col1:
                 st.metric("Words", f"{word_count:,}")
@@ -469,23 +714,24 @@ def load_document_intelligence_page():
                         # Track usage
                         if DB_AVAILABLE:
                             track_tool_usage("document_intelligence", "question_asked")
-                        
-                        with st.spinner("🔍 Finding answer..."):
-                            answer = st.session_state.doc_intelligence.answer_question(
-                                st.session_state.document_content, question
-                            )
-                            st.session_state.current_answer = answer
-                            
-                            # Save Q&A to history
-                            qa_record = {
-                                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                "document": st.session_state.current_document,
-                                "question": question,
-                                "answer": answer,
-                                "type": "Q&A"
-                            }
-                            st.session_state.document_history.append(qa_record)
-                            st.rerun()
+
+                        # Stream the answer as it arrives
+                        st.markdown("**💬 Answer:**")
+                        answer = st.write_stream(st.session_state.doc_intelligence.answer_question(
+                            st.session_state.document_content, question, stream=True
+                        ))
+                        st.session_state.current_answer = answer
+                        st.session_state._answer_streamed = True
+
+                        # Save Q&A to history
+                        qa_record = {
+                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            "document": st.session_state.current_document,
+                            "question": question,
+                            "answer": answer,
+                            "type": "Q&A"
+                        }
+                        st.session_state.document_history.append(qa_record)
                     else:
                         st.error("Please enter a question.")
             
@@ -496,45 +742,47 @@ def load_document_intelligence_page():
                     if DB_AVAILABLE:
                         track_tool_usage("document_intelligence", f"analysis_{analysis_type.lower().replace(' ', '_')}")
                     
-                    with st.spinner(f"🔍 Performing {analysis_type}..."):
-                        
-                        if analysis_type == "Translation":
-                            result = st.session_state.doc_intelligence.translate_document(
-                                st.session_state.document_content, target_language
-                            )
-                        elif analysis_type == "Entity Extraction":
-                            result = st.session_state.doc_intelligence.extract_entities(
-                                st.session_state.document_content
-                            )
-                        elif enable_comparison and st.session_state.get("second_document"):
-                            result = st.session_state.doc_intelligence.compare_documents(
-                                st.session_state.document_content,
-                                st.session_state.second_document
-                            )
-                        else:
-                            result = st.session_state.doc_intelligence.analyze_document(
-                                st.session_state.document_content, analysis_type
-                            )
-                        
-                        st.session_state.current_analysis = result
-                        
-                        # Save to history
-                        history_record = {
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "document": st.session_state.current_document,
-                            "analysis_type": analysis_type,
-                            "word_count": len(st.session_state.document_content.split()),
-                            "result": result
-                        }
-                        st.session_state.document_history.append(history_record)
-                        
-                        st.rerun()
+                    if analysis_type == "Translation":
+                        chunks = st.session_state.doc_intelligence.translate_document(
+                            st.session_state.document_content, target_language, stream=True
+                        )
+                    elif analysis_type == "Entity Extraction":
+                        chunks = st.session_state.doc_intelligence.extract_entities(
+                            st.session_state.document_content, stream=True
+                        )
+                    elif enable_comparison and st.session_state.get("second_document"):
+                        chunks = st.session_state.doc_intelligence.compare_documents(
+                            st.session_state.document_content,
+                            st.session_state.second_document, stream=True
+                        )
+                    else:
+                        chunks = st.session_state.doc_intelligence.analyze_document(
+                            st.session_state.document_content, analysis_type, stream=True
+                        )
+
+                    # Render chunks as they arrive instead of spinning on
+                    # the full completion
+                    st.markdown("**🎯 Analysis Results:**")
+                    result = st.write_stream(chunks)
+                    st.session_state.current_analysis = result
+                    st.session_state._analysis_streamed = True
+
+                    # Save to history
+                    history_record = {
+                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "document": st.session_state.current_document,
+                        "analysis_type": analysis_type,
+                        "word_count": _doc_stats(st.session_state.document_content)[0],
+                        "result": result
+                    }
+                    st.session_state.document_history.append(history_record)
             
             # Display results
             if "current_analysis" in st.session_state:
-                st.markdown("**🎯 Analysis Results:**")
-                st.write(st.session_state.current_analysis)
-                
+                if not st.session_state.pop("_analysis_streamed", False):
+                    st.markdown("**🎯 Analysis Results:**")
+                    st.write(st.session_state.current_analysis)
+
                 # Action buttons
                 col_copy, col_save = st.columns(2)
                 with col_copy:
@@ -551,9 +799,10 @@ def load_document_intelligence_page():
             
             # Display Q&A answer
             if "current_answer" in st.session_state:
-                st.markdown("**💬 Answer:**")
-                st.write(st.session_state.current_answer)
-                
+                if not st.session_state.pop("_answer_streamed", False):
+                    st.markdown("**💬 Answer:**")
+                    st.write(st.session_state.current_answer)
+
                 st.download_button(
                     label="💾 Save Q&A",
                     data=f"Q: {question if 'question' in locals() else 'Question'}\nA: {st.session_state.current_answer}",
@@ -583,40 +832,48 @@ def load_document_intelligence_page():
     st.markdown("---")
     st.markdown("## ⚡ Quick Actions")
     
-    if st.session_state.document_content and not st.session_state.document_content.startswith(("Error", "PDF processing", "DOCX processing")):
+    if st.session_state.document_ok:
+        # All four actions come out of one bundled request, so the first
+        # click pays a single round-trip and the rest hit the cache.
+        if st.button("⚡ Run All Quick Actions", use_container_width=True):
+            with st.spinner("Running summary, key points, entities and Q&A..."):
+                bundle = st.session_state.doc_intelligence.analyze_bundle(
+                    st.session_state.document_content
+                )
+            for title, field in [("📝 Summary", "summary"), ("🔑 Key Points", "key_points"),
+                                 ("🏷️ Entities", "entities"), ("❓ Q&A", "qa_pairs")]:
+                with st.expander(title, expanded=(field == "summary")):
+                    st.write(bundle[field])
+
         quick_col1, quick_col2, quick_col3, quick_col4 = st.columns(4)
-        
+
         with quick_col1:
             if st.button("📝 Quick Summary", use_container_width=True):
                 with st.spinner("Generating summary..."):
-                    summary = st.session_state.doc_intelligence.analyze_document(
-                        st.session_state.document_content, "Summary"
-                    )
-                    st.write(summary)
-        
+                    st.write(st.session_state.doc_intelligence.analyze_bundle(
+                        st.session_state.document_content
+                    )["summary"])
+
         with quick_col2:
             if st.button("🔑 Key Points", use_container_width=True):
                 with st.spinner("Extracting key points..."):
-                    points = st.session_state.doc_intelligence.analyze_document(
-                        st.session_state.document_content, "Key Points"
-                    )
-                    st.write(points)
-        
+                    st.write(st.session_state.doc_intelligence.analyze_bundle(
+                        st.session_state.document_content
+                    )["key_points"])
+
         with quick_col3:
             if st.button("🏷️ Extract Entities", use_container_width=True):
                 with st.spinner("Extracting entities..."):
-                    entities = st.session_state.doc_intelligence.extract_entities(
+                    st.write(st.session_state.doc_intelligence.analyze_bundle(
                         st.session_state.document_content
-                    )
-                    st.write(entities)
-        
+                    )["entities"])
+
         with quick_col4:
             if st.button("❓ Generate Q&A", use_container_width=True):
                 with st.spinner("Generating Q&A..."):
-                    qa = st.session_state.doc_intelligence.analyze_document(
-                        st.session_state.document_content, "Q&A Generation"
-                    )
-                    st.write(qa)
+                    st.write(st.session_state.doc_intelligence.analyze_bundle(
+                        st.session_state.document_content
+                    )["qa_pairs"])
     
     # Document History
     if st.session_state.document_history:
@@ -0,0 +1,48 @@
+"""Recursive text splitter for chunked LLM calls.
+
+Large documents can't ride in a single Gemini request, so they get split
+into chunks that respect paragraph and sentence boundaries, analyzed
+separately, and recombined by the caller (map-reduce).
+"""
+
+# ~4 characters per token is a serviceable estimate for English prose
+CHARS_PER_TOKEN = 4
+
+# Boundary preference, coarsest first: paragraphs, lines, sentences, words
+_SEPARATORS = ["\n\n", "\n", ". ", " "]
+
+def split_text(text: str, max_tokens: int = 8000) -> list:
+    """Split text into chunks of at most ~max_tokens each.
+
+    Splitting recurses from paragraph down to word boundaries so chunks
+    stay semantically coherent; only a degenerate unbroken run is ever
+    cut mid-string.
+    """
+    return _split(text, max_tokens * CHARS_PER_TOKEN, _SEPARATORS)
+
+def _split(text: str, max_chars: int, separators: list) -> list:
+    if len(text) <= max_chars:
+        return [text] if text.strip() else []
+    if not separators:
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+    sep = separators[0]
+    chunks = []
+    current = ""
+    for part in text.split(sep):
+        candidate = current + sep + part if current else part
+        if len(candidate) <= max_chars:
+            current = candidate
+            continue
+        if current.strip():
+            chunks.append(current)
+        if len(part) > max_chars:
+            # A single paragraph/sentence too big on its own: split it
+            # at the next finer boundary
+            chunks.extend(_split(part, max_chars, separators[1:]))
+            current = ""
+        else:
+            current = part
+    if current.strip():
+        chunks.append(current)
+    return chunks
@@ -349,10 +349,16 @@ class DatabaseManager:
             return uploads
     
     # Usage Statistics
-    def track_usage(self, tool_name: str, action_type: str):
-        """Track tool usage"""
-        session_id = self.get_session_id()
-        
+    def track_usage(self, tool_name: str, action_type: str,
+                    session_id: Optional[str] = None):
+        """Track tool usage.
+
+        Callers off the script thread (e.g. background telemetry
+        workers) must pass session_id explicitly — st.session_state
+        resolves to bare-mode mock state outside a script-run context.
+        """
+        session_id = session_id or self.get_session_id()
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -506,10 +512,11 @@ def save_analysis(tool_name: str, analysis_type: str, input_data: str, result: s
     db = get_database_manager()
     db.save_analysis_result(tool_name, analysis_type, input_data, result, metadata)
 
-def track_tool_usage(tool_name: str, action_type: str):
+def track_tool_usage(tool_name: str, action_type: str,
+                     session_id: Optional[str] = None):
     """Track tool usage"""
     db = get_database_manager()
-    db.track_usage(tool_name, action_type)
+    db.track_usage(tool_name, action_type, session_id)
 
 def get_user_pref(key: str, default: Any = None) -> Any:
     """Get user preference"""
@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+class LLMCache:
+    """Two-tier response cache for Gemini calls.
+
+    Tier one is an exact SHA-256 lookup on the prompt string. Tier two
+    embeds the prompt and scans stored embeddings for cosine similarity,
+    so near-duplicate prompts ("Write binary search" vs "Create a binary
+    search algorithm") also hit. Entries expire after an hour and the
+    cache is LRU-capped.
+
+    Pass similarity_threshold=None to disable the embedding tier and
+    match on the exact key only — the right mode when prompts are
+    dominated by a shared payload (e.g. a full document under different
+    instruction headers) that would make unrelated prompts embed alike.
+    """
+
+    def __init__(self, max_entries: int = 512,
+                 similarity_threshold: Optional[float] = 0.92,
+                 ttl_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (embedding, text, timestamp)
+        # Instances are shared across sessions and touched from
+        # background threads (prefetch workers), so every _entries
+        # access holds this; embedding round-trips happen outside it
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(prompt: str) -> str:
+        """Stable exact-match key for a prompt"""
+        return hashlib.sha256(prompt.encode()).hexdigest()
+
+    def _embed(self, prompt: str):
+        import numpy as np
+        import google.generativeai as genai
+        result = genai.embed_content(model="models/text-embedding-004", content=prompt)
+        vector = np.asarray(result["embedding"], dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def _evict_expired(self):
+        cutoff = time.time() - self.ttl_seconds
+        for key in [k for k, (_, _, ts) in self._entries.items() if ts < cutoff]:
+            del self._entries[key]
+
+    def get(self, key: str, prompt: str) -> Optional[str]:
+        """Return a cached response for this prompt, or None on a miss"""
+        with self._lock:
+            self._evict_expired()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][1]
+
+            if self.similarity_threshold is None or not self._entries:
+                return None
+
+        import numpy as np
+        try:
+            query = self._embed(prompt)
+        except Exception:
+            return None
+        with self._lock:
+            if self._entries:
+                keys = list(self._entries)
+                matrix = np.stack([self._entries[k][0] for k in keys])
+                scores = matrix @ query
+                best = int(np.argmax(scores))
+                if float(scores[best]) >= self.similarity_threshold:
+                    best_key = keys[best]
+                    self._entries.move_to_end(best_key)
+                    return self._entries[best_key][1]
+            # Keep the query embedding so set() doesn't re-embed
+            self._pending = (key, query)
+        return None
+
+    def set(self, key: str, prompt: str, text: str):
+        """Store a fresh response under its prompt embedding"""
+        embedding = None
+        if self.similarity_threshold is not None:
+            with self._lock:
+                pending = getattr(self, "_pending", None)
+                if pending and pending[0] == key:
+                    embedding = pending[1]
+                    self._pending = None
+            if embedding is None:
+                try:
+                    embedding = self._embed(prompt)
+                except Exception:
+                    return
+        with self._lock:
+            self._entries[key] = (embedding, text, time.time())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+# Global cache instance
+llm_cache = None
+
+def get_llm_cache() -> LLMCache:
+    """Get or create a process-wide cache instance"""
+    global llm_cache
+    if llm_cache is None:
+        llm_cache = LLMCache()
+    return llm_cache